@@ -1,9 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from typing import Dict, Any, List, Optional
 import logging
 
 from .service import ChatbotService, get_chatbot_service
-from .models import QuestionRequest, ChatbotResponse, ErrorResponse
+from .models import (
+    QuestionRequest,
+    BatchQuestionRequest,
+    ChatbotResponse,
+    BatchChatbotResponse,
+    ErrorResponse,
+    MAX_QUESTION_LENGTH
+)
 
 
 # Router para los endpoints del chatbot
@@ -53,8 +62,8 @@ async def ask_question(
                 detail="La pregunta no puede estar vacía"
             )
 
-        # Llamar al servicio para obtener la respuesta
-        result = chatbot_service.answer_user_question(request.question.strip())
+        # Llamar al servicio en el threadpool para no bloquear el event loop
+        result = await run_in_threadpool(chatbot_service.answer_user_question, request.question.strip())
 
         if not result.get("success", False):
             # Si el servicio indica que no fue exitoso pero no es un error crítico
@@ -76,6 +85,91 @@ async def ask_question(
         )
 
 
+@router.post(
+    "/ask_batch",
+    response_model=BatchChatbotResponse,
+    summary="Hacer varias preguntas al chatbot",
+    description="Envía un lote de preguntas y recibe las respuestas en el mismo orden",
+    responses={
+        200: {
+            "description": "Respuestas del chatbot",
+            "model": BatchChatbotResponse
+        },
+        400: {
+            "description": "Error en la solicitud",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Error interno del servidor",
+            "model": ErrorResponse
+        }
+    }
+)
+async def ask_questions(
+    request: BatchQuestionRequest,
+    chatbot_service: ChatbotService = Depends(get_chatbot_service)
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Procesa un lote de preguntas en una sola petición.
+
+    - **questions**: Las preguntas que quieres hacer al chatbot
+
+    La interfaz agrupa los envíos concurrentes de varios usuarios en una sola llamada.
+    Los errores se devuelven por pregunta (success=False), sin fallar el lote completo.
+    """
+    questions = [question.strip() for question in request.questions]
+
+    # Cada pregunta se valida por separado: una pregunta inválida no invalida el lote completo
+    pending: List[int] = []
+    results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+    for i, question in enumerate(questions):
+        if not question:
+            results[i] = _batch_error_result(
+                question, "La pregunta no puede estar vacía", answer="La pregunta no puede estar vacía."
+            )
+        elif len(question) > MAX_QUESTION_LENGTH:
+            message = f"La pregunta no puede superar los {MAX_QUESTION_LENGTH} caracteres"
+            results[i] = _batch_error_result(question, message, answer=f"{message}.")
+        else:
+            pending.append(i)
+
+    try:
+        answers = await run_in_threadpool(
+            chatbot_service.answer_user_questions,
+            [questions[i] for i in pending]
+        )
+    except Exception as e:
+        logging.error(f"Error en el endpoint ask_questions: {e}")
+        answers = [None] * len(pending)
+        error = f"Error interno del servidor: {str(e)}"
+    else:
+        error = None
+
+    for i, answer in zip(pending, answers):
+        if answer is None:
+            results[i] = _batch_error_result(questions[i], error)
+            continue
+        try:
+            results[i] = ChatbotResponse.model_validate(answer).model_dump()
+        except ValidationError as e:
+            logging.error(f"Respuesta inválida en el lote (índice {i}): {e}")
+            results[i] = _batch_error_result(questions[i], "Respuesta inválida del servicio")
+
+    return {"results": results}
+
+
+def _batch_error_result(question: str, error: str, answer: Optional[str] = None) -> Dict[str, Any]:
+    """Resultado de error para una sola pregunta de un lote."""
+    return {
+        "success": False,
+        "error": error,
+        "answer": answer or "Lo siento, ocurrió un error inesperado. Por favor, inténtalo de nuevo.",
+        "question": question,
+        "sources": [],
+        "images": []
+    }
+
+
 @router.get(
     "/health",
     summary="Verificar estado del chatbot",
@@ -2,9 +2,13 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 
 
+# Longitud máxima de una pregunta (también se comprueba por pregunta en los lotes)
+MAX_QUESTION_LENGTH = 500
+
+
 class QuestionRequest(BaseModel):
     """Modelo para la pregunta del usuario"""
-    question: str = Field(..., min_length=1, max_length=500, description="Pregunta del usuario")
+    question: str = Field(..., min_length=1, max_length=MAX_QUESTION_LENGTH, description="Pregunta del usuario")
 
     class Config:
         schema_extra = {
@@ -14,6 +18,26 @@ class QuestionRequest(BaseModel):
         }
 
 
+class BatchQuestionRequest(BaseModel):
+    """
+    Modelo para un lote de preguntas (varios usuarios agrupados por la interfaz).
+    Cada pregunta se valida en el controlador para que una inválida no rechace el lote.
+    """
+    questions: List[str] = Field(
+        ..., min_length=1, max_length=16, description="Preguntas de los usuarios"
+    )
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "questions": [
+                    "¿Cuáles son los beneficios del machine learning?",
+                    "¿Qué es un modelo de lenguaje?"
+                ]
+            }
+        }
+
+
 class SourceInfo(BaseModel):
     """Información de una fuente encontrada"""
     text: str = Field(..., description="Fragmento de texto relevante")
@@ -30,6 +54,12 @@ class ChatbotResponse(BaseModel):
     images: List[str] = Field(default=[], description="Rutas de imágenes relacionadas")
     total_results: Optional[int] = Field(None, description="Número total de resultados encontrados")
     question: str = Field(..., description="Pregunta original del usuario")
+    error: Optional[str] = Field(None, description="Descripción del error si la pregunta no se pudo responder")
+
+
+class BatchChatbotResponse(BaseModel):
+    """Respuestas del chatbot para un lote de preguntas, en el mismo orden"""
+    results: List[ChatbotResponse] = Field(..., description="Respuesta para cada pregunta")
 
 
 class ErrorResponse(BaseModel):
@@ -6,7 +6,7 @@ from src.rewritter.rewriter import rewriter_runnable
 from src.utils.embeddings.generator import EmbeddingsGenerator
 from src.llm.chain_manager import LLMChainManager
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from fastapi import Depends
 import os
 from dotenv import load_dotenv
@@ -254,6 +254,21 @@ class ChatbotService:
                 "chains_used": {"error": True}
             }
 
+    def answer_user_questions(self, questions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Responde un lote de preguntas en paralelo usando la chain completa.
+
+        Args:
+            questions (List[str]): Preguntas de los usuarios
+
+        Returns:
+            Lista de respuestas en el mismo orden que las preguntas
+        """
+        self.logger.debug(f"Procesando lote de {len(questions)} preguntas")
+
+        # Cada pregunta gestiona sus propios errores, así un fallo no invalida el lote
+        return RunnableLambda(self.answer_user_question).batch(questions)
+
     def ask_simple_question(self, question: str) -> Dict[str, Any]:
         """
         Hace una pregunta simple usando solo validación de entrada, LLM directo y validación de salida.
@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field
 class ExtractedContent:
     """Clase para almacenar contenido extraído del PDF."""
     text_chunks: List[str]
-    images: List[Dict[str, Any]]  # {image: PIL.Image, page: int, bbox: tuple}
+    images: List[Dict[str, Any]]  # {page: int, bbox: tuple, image_path: str, filename: str, size: tuple}
     metadata: List[Dict[str, Any]]  # Metadatos para cada chunk
 
 
@@ -4,7 +4,7 @@ from src.utils.preprocessing.pdf_processor import PDFPreprocessor
 from src.utils.embeddings.generator import EmbeddingsGenerator
 import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from fastapi import Depends
 from src.container import (
     pdf_processor_dependency,
@@ -36,17 +36,25 @@ class IngestionService:
         self.vector_store = vector_store
         self.logger = logger
 
-    def transform_pdf_to_embeddings(self) -> Dict[str, Any]:
+    def transform_pdf_to_embeddings(self,
+                                    file_path: Optional[str] = None,
+                                    content: Optional[ExtractedContent] = None) -> Dict[str, Any]:
         """
         Procesa un PDF y genera embeddings almacenándolos en el vector store.
 
+        Args:
+            file_path (str, optional): Ruta del PDF (por defecto src/data/rag-challenge.pdf)
+            content (ExtractedContent, optional): Contenido ya extraído del PDF; si se pasa,
+                no se vuelve a extraer
+
         Returns:
             Dict[str, Any]: Resultado del procesamiento con estadísticas
         """
         import os
         # Obtener la ruta absoluta del archivo PDF
-        current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        file_path = os.path.join(current_dir, "data", "rag-challenge.pdf")
+        if file_path is None:
+            current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            file_path = os.path.join(current_dir, "data", "rag-challenge.pdf")
 
         # Verificar que el archivo existe
         if not os.path.exists(file_path):
@@ -55,8 +63,9 @@ class IngestionService:
         try:
             self.logger.info(f"Iniciando procesamiento de PDF: {file_path}")
 
-            # 1. Extraer contenido del PDF
-            content: ExtractedContent = self.pdf_processor.extract_content_from_pdf(file_path)
+            # 1. Extraer contenido del PDF (salvo que el llamador ya lo haya extraído)
+            if content is None:
+                content = self.pdf_processor.extract_content_from_pdf(file_path)
 
             if not content.text_chunks:
                 raise ValueError("No se pudo extraer texto del PDF")
@@ -3,6 +3,7 @@ Inyección de dependencias usando FastAPI Depends.
 Mucho más simple que crear un contenedor personalizado.
 """
 import logging
+import os
 from functools import lru_cache
 from fastapi import Depends
 from dotenv import load_dotenv
@@ -25,6 +26,11 @@ from src.llm.prompts.prompt_manager import PromptManager
 configure_logging(LogLevels.info)
 
 
+def _embeddings_cache_dir():
+    """Directorio de la caché persistente de embeddings (EMBEDDINGS_CACHE_DIR); vacío la desactiva."""
+    return os.getenv("EMBEDDINGS_CACHE_DIR") or None
+
+
 # Factory functions para crear dependencias (similar a @Bean en Spring Boot)
 @lru_cache()
 def get_logger() -> logging.Logger:
@@ -41,7 +47,7 @@ def get_pdf_processor() -> PDFPreprocessor:
 @lru_cache()
 def get_embeddings_generator() -> EmbeddingsGenerator:
     """Crea un EmbeddingsGenerator singleton."""
-    return EmbeddingsGenerator()
+    return EmbeddingsGenerator(cache_dir=_embeddings_cache_dir())
 
 
 @lru_cache()
@@ -118,7 +124,7 @@ def create_pdf_processor() -> PDFPreprocessor:
 
 def create_embeddings_generator() -> EmbeddingsGenerator:
     """Factory function para crear EmbeddingsGenerator fuera del contexto de FastAPI."""
-    return EmbeddingsGenerator()
+    return EmbeddingsGenerator(cache_dir=_embeddings_cache_dir())
 
 
 def create_vector_store() -> FAISSVectorStore:
@@ -2,9 +2,52 @@ import faiss
 import numpy as np
 import pickle
 import os
+from collections import defaultdict
+from functools import lru_cache
 from typing import List, Dict, Any, Tuple, Optional
 import logging
 
+# orjson (extensión en C) serializa los metadatos varias veces más rápido que json estándar
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    import json
+    HAS_ORJSON = False
+
+
+# Parámetros HNSW: vecinos por nodo y amplitud de búsqueda en construcción/consulta
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# faiss-gpu es opcional: con faiss-cpu o sin GPU visible los índices se quedan en CPU
+HAS_FAISS_GPU = hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0
+
+# Tipos de índice con implementación en GPU (HNSW y el SQ8 plano solo existen en CPU;
+# la cuantización escalar en GPU es únicamente IVF-SQ)
+GPU_INDEX_TYPES = {"flat", "ip", "ivf"}
+
+
+@lru_cache(maxsize=1)
+def _get_gpu_resources():
+    """Recursos de GPU (memoria temporal, streams) compartidos por todos los índices."""
+    return faiss.StandardGpuResources()
+
+
+def _dump_json(obj: Dict[str, Any]) -> bytes:
+    """Serializa los metadatos a JSON (orjson si está disponible)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _load_json(data: bytes) -> Dict[str, Any]:
+    """Deserializa metadatos JSON (orjson si está disponible)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class FAISSVectorStore:
     """
@@ -12,16 +55,19 @@ class FAISSVectorStore:
     Almacena embeddings de texto y metadatos que vinculan texto con imágenes extraídas de PDFs.
     """
 
-    def __init__(self, dimension: int = 384, index_type: str = "flat"):
+    def __init__(self, dimension: int = 384, index_type: str = "flat", use_gpu: bool = False):
         """
         Inicializa la instancia de FAISS.
 
         Args:
             dimension (int): Dimensión de los embeddings (por defecto 384 para all-MiniLM-L6-v2)
-            index_type (str): Tipo de índice FAISS ('flat', 'ivf', 'hnsw')
+            index_type (str): Tipo de índice FAISS ('flat', 'ip', 'sq8', 'ivf', 'hnsw')
+            use_gpu (bool): Mover el índice a la GPU 0 si hay una disponible y el tipo lo soporta
         """
         self.dimension = dimension
         self.index_type = index_type
+        self.use_gpu = use_gpu
+        self.on_gpu = False
         self.index = None
         self.metadata = []  # Lista para almacenar metadatos de cada embedding
         self.id_to_index = {}  # Mapeo de ID personalizado a índice FAISS
@@ -37,17 +83,46 @@ class FAISSVectorStore:
         if self.index_type == "flat":
             # Índice plano (L2 distance) - más preciso pero más lento para grandes datasets
             self.index = faiss.IndexFlatL2(self.dimension)
+        elif self.index_type == "ip":
+            # Índice plano por producto interno: con embeddings normalizados es la similitud coseno
+            self.index = faiss.IndexFlatIP(self.dimension)
+        elif self.index_type == "sq8":
+            # Producto interno sobre vectores cuantizados a 8 bits: 4x menos memoria que float32
+            self.index = faiss.IndexScalarQuantizer(
+                self.dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
         elif self.index_type == "ivf":
             # Índice IVF (Inverted File) - más rápido para datasets grandes
             quantizer = faiss.IndexFlatL2(self.dimension)
             self.index = faiss.IndexIVFFlat(quantizer, self.dimension, 100)  # 100 clusters
         elif self.index_type == "hnsw":
             # HNSW (Hierarchical Navigable Small World) - muy rápido y preciso
-            self.index = faiss.IndexHNSWFlat(self.dimension, 32)
+            self.index = faiss.IndexHNSWFlat(self.dimension, HNSW_M)
+            self.index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            self.index.hnsw.efSearch = HNSW_EF_SEARCH
         else:
             raise ValueError(f"Tipo de índice no soportado: {self.index_type}")
 
-        self.logger.info(f"Índice FAISS inicializado: {self.index_type}, dimensión: {self.dimension}")
+        self.index = self._to_device(self.index)
+
+        self.logger.info(
+            f"Índice FAISS inicializado: {self.index_type}, dimensión: {self.dimension}, GPU: {self.on_gpu}"
+        )
+
+    def _to_device(self, index):
+        """Mueve el índice a la GPU si se pidió, hay una disponible y el tipo de índice lo soporta."""
+        self.on_gpu = False
+        if not (self.use_gpu and HAS_FAISS_GPU and self.index_type in GPU_INDEX_TYPES):
+            return index
+
+        try:
+            gpu_index = faiss.index_cpu_to_gpu(_get_gpu_resources(), 0, index)
+        except Exception as e:
+            self.logger.warning(f"No se pudo mover el índice {self.index_type} a GPU, se usa CPU: {e}")
+            return index
+
+        self.on_gpu = True
+        return gpu_index
 
     def add_embeddings(self,
                       embeddings: Optional[np.ndarray] = None,
@@ -61,7 +136,8 @@ class FAISSVectorStore:
         Puede recibir parámetros individuales O un diccionario processed_data del IngestionService.
 
         Args:
-            embeddings (np.ndarray, optional): Array de embeddings de forma (n_samples, dimension)
+            embeddings (np.ndarray, optional): Array de embeddings de forma (n_samples, dimension);
+                si ya es float32 C-contiguo se usa tal cual (sin copia) y se normaliza en el propio array
             text_chunks (List[str], optional): Lista de textos correspondientes a cada embedding
             metadata (List[Dict[str, Any]], optional): Metadatos para cada chunk
             images (List[Dict[str, Any]], optional): Lista de imágenes del PDF
@@ -92,18 +168,27 @@ class FAISSVectorStore:
             metadata = [{"chunk_id": f"chunk_{i}", "page_number": None, "chunk_index": i}
                        for i in range(len(text_chunks))]
 
+        # FAISS exige float32 C-contiguo: convertir una sola vez aquí (no copia si ya lo es)
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
         # Normalizar embeddings para búsqueda por cosine similarity
         faiss.normalize_L2(embeddings)
 
-        # Entrenar el índice si es necesario (para IVF)
-        if self.index_type == "ivf" and not self.index.is_trained:
-            self.logger.info("Entrenando índice IVF...")
+        # Entrenar el índice si es necesario (IVF, SQ8) con la matriz completa de una vez:
+        # entrenar por lotes parciales degrada el recall
+        if not self.index.is_trained:
+            self.logger.info(f"Entrenando índice {self.index_type.upper()}...")
             self.index.train(embeddings)
 
         # Agregar embeddings al índice
         start_idx = len(self.metadata)
         self.index.add(embeddings)
 
+        # Agrupar las imágenes por página una sola vez en lugar de recorrerlas por cada chunk
+        images_by_page = defaultdict(list)
+        for img in images or []:
+            images_by_page[img.get("page")].append(img)
+
         # Generar IDs y agregar metadatos enriquecidos
         assigned_ids = []
         for i, (text, chunk_metadata) in enumerate(zip(text_chunks, metadata)):
@@ -114,9 +199,9 @@ class FAISSVectorStore:
             page_number = chunk_metadata.get("page_number")
             #self.logger.info(f"Documento! {doc_id} ({page_number}) {text}")
             associated_images = []
-            if images and page_number is not None:
+            if page_number is not None:
                 #self.logger.info(f"Imagenes del PDF de acuerdo a la pag: {images[page_number]}")
-                associated_images = [img for img in images if img.get("page") == page_number]
+                associated_images = images_by_page.get(page_number, [])
 
             # Crear metadatos enriquecidos para FAISS
             faiss_metadata = {
@@ -153,36 +238,91 @@ class FAISSVectorStore:
         Returns:
             Tuple[List[float], List[Dict[str, Any]]]: (distancias, metadatos)
         """
-        if len(query_embedding.shape) == 1:
-            query_embedding = query_embedding.reshape(1, -1)
+        distances, indices = self.search_ids_only(query_embedding, k)
 
-        if query_embedding.shape[1] != self.dimension:
-            raise ValueError(f"Dimensión del query ({query_embedding.shape[1]}) no coincide con la esperada ({self.dimension})")
+        results = self._build_results(distances[0], indices[0], return_metadata)
+        self.logger.info(f"resultados de busqueda: {distances[0].tolist(), results}")
+        return distances[0].tolist(), results
 
-        # Normalizar query embedding
-        faiss.normalize_L2(query_embedding)
+    def search_batch(self,
+                     query_embeddings: np.ndarray,
+                     k: int = 5,
+                     return_metadata: bool = True) -> Tuple[List[List[float]], List[List[Dict[str, Any]]]]:
+        """
+        Busca los k embeddings más similares para varias consultas en una sola llamada a FAISS.
 
-        # Realizar búsqueda
-        distances, indices = self.index.search(query_embedding, k)
+        Args:
+            query_embeddings (np.ndarray): Embeddings de las consultas (n_queries, dimension)
+            k (int): Número de resultados a retornar por consulta
+            return_metadata (bool): Si retornar metadatos completos
 
-        # Obtener metadatos
+        Returns:
+            Tuple[List[List[float]], List[List[Dict[str, Any]]]]: (distancias, metadatos) por consulta
+        """
+        distances, indices = self.search_ids_only(query_embeddings, k)
+
+        results = [
+            self._build_results(row_distances, row_indices, return_metadata)
+            for row_distances, row_indices in zip(distances, indices)
+        ]
+        self.logger.info(f"Búsqueda por lotes: {len(results)} consultas, k={k}")
+        return distances.tolist(), results
+
+    def search_ids_only(self, query_embeddings: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca sin construir metadatos: devuelve las matrices (distancias, índices) de FAISS tal cual.
+        El llamador hidrata con self.metadata[idx] solo los resultados que realmente usa
+        (idx == -1 indica que no hubo suficientes resultados).
+
+        Args:
+            query_embeddings (np.ndarray): Embedding(s) de consulta (dimension,) o (n_queries, dimension)
+            k (int): Número de resultados a retornar por consulta
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (distancias, índices), ambas de forma (n_queries, k)
+        """
+        if len(query_embeddings.shape) == 1:
+            query_embeddings = query_embeddings.reshape(1, -1)
+
+        if query_embeddings.shape[1] != self.dimension:
+            raise ValueError(f"Dimensión del query ({query_embeddings.shape[1]}) no coincide con la esperada ({self.dimension})")
+
+        # Normalizar query embeddings (float32 C-contiguo, sin copia si ya lo es)
+        query_embeddings = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        faiss.normalize_L2(query_embeddings)
+
+        # Una sola búsqueda (n_queries, dimension) en lugar de una por consulta
+        return self.index.search(query_embeddings, k)
+
+    def distance_to_similarity(self, distance: float) -> float:
+        """Convierte un score de FAISS en similitud: con producto interno ya es la similitud coseno."""
+        if self.index.metric_type == faiss.METRIC_INNER_PRODUCT:
+            return float(distance)
+        return 1.0 / (1.0 + float(distance))
+
+    def _build_results(self,
+                       distances: np.ndarray,
+                       indices: np.ndarray,
+                       return_metadata: bool) -> List[Dict[str, Any]]:
+        """Construye la lista de resultados de una consulta a partir de una fila de FAISS."""
         results = []
-        for i, idx in enumerate(indices[0]):
+        for i, idx in enumerate(indices):
             if idx != -1 and idx < len(self.metadata):  # -1 indica que no se encontraron suficientes resultados
+                distance = float(distances[i])
+                similarity = self.distance_to_similarity(distance)
                 if return_metadata:
                     result = self.metadata[idx].copy()
-                    result["distance"] = float(distances[0][i])
-                    result["similarity"] = 1.0 / (1.0 + float(distances[0][i]))  # Convertir distancia a similitud
+                    result["distance"] = distance
+                    result["similarity"] = similarity
                 else:
                     result = {
                         "id": self.metadata[idx]["id"],
                         "text": self.metadata[idx]["text"],
-                        "distance": float(distances[0][i]),
-                        "similarity": 1.0 / (1.0 + float(distances[0][i]))
+                        "distance": distance,
+                        "similarity": similarity
                     }
                 results.append(result)
-        self.logger.info(f"resultados de busqueda: {distances[0].tolist(), results}")
-        return distances[0].tolist(), results
+        return results
 
     def get_by_id(self, doc_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -206,20 +346,21 @@ class FAISSVectorStore:
         Args:
             filepath (str): Ruta base para guardar los archivos (sin extensión)
         """
-        # Guardar índice FAISS
-        faiss.write_index(self.index, f"{filepath}.faiss")
+        # Guardar índice FAISS (los índices en GPU se serializan desde su copia en CPU)
+        cpu_index = faiss.index_gpu_to_cpu(self.index) if self.on_gpu else self.index
+        faiss.write_index(cpu_index, f"{filepath}.faiss")
 
-        # Guardar metadatos y mapeos
+        # Guardar metadatos y mapeos (JSON: las claves de id_to_index se guardan como pares)
         metadata_dict = {
             "metadata": self.metadata,
-            "id_to_index": self.id_to_index,
+            "id_to_index": list(self.id_to_index.items()),
             "next_id": self.next_id,
             "dimension": self.dimension,
             "index_type": self.index_type
         }
 
-        with open(f"{filepath}_metadata.pkl", "wb") as f:
-            pickle.dump(metadata_dict, f)
+        with open(f"{filepath}_metadata.json", "wb") as f:
+            f.write(_dump_json(metadata_dict))
 
         self.logger.info(f"Índice FAISS guardado en: {filepath}")
 
@@ -233,21 +374,29 @@ class FAISSVectorStore:
         if not os.path.exists(f"{filepath}.faiss"):
             raise FileNotFoundError(f"Archivo de índice no encontrado: {filepath}.faiss")
 
-        if not os.path.exists(f"{filepath}_metadata.pkl"):
-            raise FileNotFoundError(f"Archivo de metadatos no encontrado: {filepath}_metadata.pkl")
+        json_path = f"{filepath}_metadata.json"
+        pkl_path = f"{filepath}_metadata.pkl"  # Formato anterior, se sigue pudiendo cargar
+        if not os.path.exists(json_path) and not os.path.exists(pkl_path):
+            raise FileNotFoundError(f"Archivo de metadatos no encontrado: {json_path}")
 
         # Cargar índice FAISS
-        self.index = faiss.read_index(f"{filepath}.faiss")
+        index = faiss.read_index(f"{filepath}.faiss")
 
         # Cargar metadatos
-        with open(f"{filepath}_metadata.pkl", "rb") as f:
-            metadata_dict = pickle.load(f)
+        if os.path.exists(json_path):
+            with open(json_path, "rb") as f:
+                metadata_dict = _load_json(f.read())
+            metadata_dict["id_to_index"] = dict(metadata_dict["id_to_index"])
+        else:
+            with open(pkl_path, "rb") as f:
+                metadata_dict = pickle.load(f)
 
         self.metadata = metadata_dict["metadata"]
         self.id_to_index = metadata_dict["id_to_index"]
         self.next_id = metadata_dict["next_id"]
         self.dimension = metadata_dict["dimension"]
         self.index_type = metadata_dict["index_type"]
+        self.index = self._to_device(index)
 
         self.logger.info(f"Índice FAISS cargado desde: {filepath}")
 
@@ -263,6 +412,7 @@ class FAISSVectorStore:
             "dimension": self.dimension,
             "index_type": self.index_type,
             "is_trained": getattr(self.index, 'is_trained', True),
+            "on_gpu": self.on_gpu,
             "metadata_count": len(self.metadata)
         }
 
@@ -276,15 +426,16 @@ class FAISSVectorStore:
 
 
 # Función de conveniencia para crear una instancia
-def create_faiss_store(dimension: int = 384, index_type: str = "flat") -> FAISSVectorStore:
+def create_faiss_store(dimension: int = 384, index_type: str = "flat", use_gpu: bool = False) -> FAISSVectorStore:
     """
     Función de conveniencia para crear una instancia de FAISSVectorStore.
 
     Args:
         dimension (int): Dimensión de los embeddings
         index_type (str): Tipo de índice FAISS
+        use_gpu (bool): Mover el índice a GPU si hay una disponible
 
     Returns:
         FAISSVectorStore: Instancia configurada
     """
-    return FAISSVectorStore(dimension=dimension, index_type=index_type)
+    return FAISSVectorStore(dimension=dimension, index_type=index_type, use_gpu=use_gpu)
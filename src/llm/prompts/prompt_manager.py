@@ -114,7 +114,7 @@ class PromptManager:
         question = ' '.join(question.split())
 
         # Asegurar que termine con signo de interrogación
-        if not question.endswith('?'):
+        if not question or question[-1] != '?':
             question += "?"
 
         return question
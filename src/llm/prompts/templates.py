@@ -1,7 +1,8 @@
 """
 Plantillas de prompts para el sistema RAG.
 """
-from typing import Dict, Any
+from string import Formatter
+from typing import Dict, Any, Tuple
 
 
 class PromptTemplates:
@@ -55,5 +56,21 @@ ANSWER:"""
         if len(context) > max_context_length:
             context = context[:max_context_length] + "..."
 
-        template = PromptTemplates.get_rag_prompt_template()
-        return template.format(context=context, question=question, images_length= images_length)
+        prefix, after_context, after_question, suffix = _RAG_PROMPT_PARTS
+        return f"{prefix}{context}{after_context}{question}{after_question}{images_length}{suffix}"
+
+
+def _split_rag_template() -> Tuple[str, str, str, str]:
+    """
+    Separa la plantilla RAG en sus partes literales alrededor de los marcadores {campo}.
+
+    Se ejecuta una sola vez al importar el módulo para evitar el parseo de .format en cada prompt.
+    """
+    parsed = list(Formatter().parse(PromptTemplates.get_rag_prompt_template()))
+    fields = [field for _, field, _, _ in parsed if field is not None]
+    if fields != ["context", "question", "images_length"]:
+        raise ValueError(f"Campos inesperados en la plantilla RAG: {fields}")
+    return tuple(literal for literal, _, _, _ in parsed)
+
+
+_RAG_PROMPT_PARTS = _split_rag_template()
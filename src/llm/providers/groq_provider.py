@@ -77,7 +77,7 @@ class GroqProvider:
         try:
             client = self._get_client()
 
-            self.logger.debug(f"Enviando prompt a Groq: {prompt[:100]}...")
+            self.logger.debug("Enviando prompt a Groq: %.100s...", prompt)
 
             response = client.invoke(prompt)
 
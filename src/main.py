@@ -1,11 +1,14 @@
+import os
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from src.app.ingestion.controller import router as ingestion_router
 from src.app.chatbot.controller import router as chatbot_router
 
 app = FastAPI(
     title="RAG Challenge API",
     description="API para procesamiento de documentos PDF y generación de embeddings",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Incluir el router de ingestion
@@ -24,3 +27,19 @@ async def root():
         "health": "/ingestion/health",
         "chatbot_health": "/chatbot/health"
     }
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # "auto" elige uvloop + httptools si están instalados (uvloop no existe en Windows):
+    # el pipeline RAG está limitado por I/O de red (Groq).
+    # Un solo worker por defecto: el vector store FAISS vive en memoria del proceso.
+    uvicorn.run(
+        "src.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("UVICORN_WORKERS", "1"))
+    )
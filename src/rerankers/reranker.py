@@ -1,18 +1,51 @@
 from langchain_core.runnables import RunnableLambda
 from sentence_transformers import CrossEncoder
 import logging
+import os
 from typing import Dict, Any
 
+logger = logging.getLogger(__name__)
+
+# BetterTransformer (optimum) es opcional: fusiona los kernels de atención del cross-encoder
+try:
+    from optimum.bettertransformer import BetterTransformer
+    HAS_BETTER_TRANSFORMER = True
+except ImportError:
+    BetterTransformer = None
+    HAS_BETTER_TRANSFORMER = False
+
+
+def _optimize_cross_encoder(encoder: CrossEncoder) -> CrossEncoder:
+    """
+    Aplica BetterTransformer y, si RERANKER_TORCH_COMPILE=1, torch.compile al modelo subyacente.
+    Se ejecuta una sola vez al importar el módulo, fuera del camino caliente.
+    """
+    if HAS_BETTER_TRANSFORMER:
+        try:
+            encoder.model = BetterTransformer.transform(encoder.model)
+            logger.info("BetterTransformer aplicado al cross-encoder")
+        except Exception as e:
+            logger.warning(f"No se pudo aplicar BetterTransformer: {e}")
+
+    if os.getenv("RERANKER_TORCH_COMPILE") == "1":
+        try:
+            import torch
+            encoder.model = torch.compile(encoder.model, mode="reduce-overhead", dynamic=True)
+            logger.info("torch.compile aplicado al cross-encoder")
+        except Exception as e:
+            logger.warning(f"No se pudo compilar el cross-encoder: {e}")
+
+    return encoder
+
+
 # Inicializar el cross-encoder globalmente para eficiencia
-cross_encoder = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
+cross_encoder = _optimize_cross_encoder(CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2"))
 
 def rerank_results(context_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Reordena los resultados de búsqueda usando un cross-encoder
     para mejorar la relevancia basada en la pregunta del usuario.
     """
-    logger = logging.getLogger(__name__)
-
     try:
         # Extraer datos necesarios
         question = context_data.get("question", "")
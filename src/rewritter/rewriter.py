@@ -1,20 +1,43 @@
 from langchain_core.runnables import RunnableLambda
 
 from src.llm.providers.groq_provider import GroqProvider
+from functools import lru_cache
 import logging
 
-def rewrite_user_question(user_question: str) -> str:
-    logger = logging.getLogger(__name__)
+logger = logging.getLogger(__name__)
 
+# Palabras interrogativas que indican una pregunta ya bien formada
+QUESTION_WORDS = frozenset({"what", "who", "how", "why", "cuál", "qué", "cómo"})
+MIN_WELL_FORMED_WORDS = 8
 
-    try:
-        groq_provider = GroqProvider(
-            model="llama-3.1-8b-instant",
-            temperature=0.1,  # Temperatura baja para respuestas más consistentes
-            logger=logger
-        )
 
-        rewrite_prompt = f"""
+def is_well_formed_question(user_question: str) -> bool:
+    """
+    Heurística barata para detectar preguntas largas y específicas que no ganan nada al reescribirse.
+    """
+    question = user_question.strip()
+    if len(question.split()) < MIN_WELL_FORMED_WORDS or not question.endswith('?'):
+        return False
+
+    # Palabras completas, no subcadenas: "who" no debe coincidir con "whole" ni "how" con "show"
+    lowered = question.lower()
+    tokens = (token.strip("¿?¡!.,;:") for token in lowered.split())
+    return any(token in QUESTION_WORDS for token in tokens)
+
+
+@lru_cache(maxsize=256)
+def _rewrite_with_llm(user_question: str) -> str:
+    """
+    Reescribe la pregunta con el LLM. Los resultados se cachean para repeticiones exactas;
+    las excepciones no se cachean, así que un fallo puntual no queda memorizado.
+    """
+    groq_provider = GroqProvider(
+        model="llama-3.1-8b-instant",
+        temperature=0.1,  # Temperatura baja para respuestas más consistentes
+        logger=logger
+    )
+
+    rewrite_prompt = f"""
 You are a question rewriter for a document retrieval system. Your job is to improve user questions to make them more specific and searchable while keeping them as natural language questions.
 
 IMPORTANT RULES:
@@ -34,10 +57,20 @@ USER QUESTION:
 
 Rewrite this question to be more specific and searchable while keeping it as a natural language question:"""
 
-        question_rewritted = groq_provider.generate_response(rewrite_prompt)
-        logger.info(f"Rewrite result: {question_rewritted}")
+    question_rewritted = groq_provider.generate_response(rewrite_prompt)
+    logger.info(f"Rewrite result: {question_rewritted}")
 
-        return question_rewritted
+    return question_rewritted
+
+
+def rewrite_user_question(user_question: str) -> str:
+    # Preguntas largas y específicas no necesitan pasar por el LLM
+    if is_well_formed_question(user_question):
+        logger.info("Question already well-formed, skipping rewrite")
+        return user_question
+
+    try:
+        return _rewrite_with_llm(user_question)
     except Exception as e:
         logger.error(f"Error in question rewriting: {e}. Returning original question.")
         return user_question
@@ -1,82 +1,142 @@
+import asyncio
 import gradio as gr
+import httpx
 import requests
 import os
+import sys
+from time import monotonic
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from components.html_components import (
     get_header_html,
     get_features_html,
     get_footer_html,
     get_status_html
 )
-from utils.style_loader import load_css, get_theme_config
+from utils.style_loader import CSS_PATH, load_css, get_css_head, get_theme_config
 
-API_URL = "http://127.0.0.1:8000/chatbot/ask"
+# Use uvloop for the event loops Gradio's server creates (uvicorn's "auto" loop/http
+# settings also pick uvloop/httptools when they are installed)
+if sys.platform != "win32":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+ASK_BATCH_URL = "http://127.0.0.1:8000/chatbot/ask_batch"
+STATUS_URL = "http://127.0.0.1:8000/docs"
+
+# Connect timeout is short; the read timeout covers the several LLM calls in the RAG pipeline
+ASK_TIMEOUT = httpx.Timeout(60.0, connect=3.0)
+
+# Shared async client: chat handlers await the backend without blocking Gradio's event loop
+CLIENT = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=ASK_TIMEOUT,
+    transport=httpx.AsyncHTTPTransport(retries=2)
+)
+
+# Shared HTTP session for the synchronous status probe (also called while building the Blocks)
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.1)
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
 
-# Global variable to store current images
-current_images = []
+# Short-lived cache for the status probe so repeated refresh clicks don't hit the backend each time
+STATUS_TTL = 2.0
+_STATUS_CACHE = {"t": float("-inf"), "html": ""}
 
 def handle_user_message(message, history):
     """
     Adds the user's message to the chat history.
     The history is a list of lists, where each inner list has two elements: [user_message, bot_response].
+    Empty messages are not queued, so they never reach the batched backend call.
     """
+    if not message or not message.strip():
+        return message, history
     history.append([message, None])
     return "", history
 
-def get_bot_response(history):
+def _gallery_paths(images):
+    """Returns the absolute paths of the images that exist on disk."""
+    abs_paths = (os.path.abspath(image_path) for image_path in images)
+    return [abs_path for abs_path in abs_paths if os.path.exists(abs_path)]
+
+async def get_bot_response(histories):
     """
-    Gets the bot's response from the backend and updates the last message in the history.
-    The bot's response can be a string or a list containing text and image paths.
+    Gets the bot's responses from the backend and updates the last message in each history.
+    Gradio batches concurrent submits, so this receives a list of histories and sends
+    all their pending questions to the backend in a single request.
+    Errors reported for one question only affect that user's history.
+    Returns the updated histories together with the related image paths for each gallery.
     """
-    global current_images
-    user_message = history[-1][0]
+    galleries = [gr.skip() for _ in histories]
+
+    # Only histories whose last message is still waiting for an answer
+    pending = [i for i, history in enumerate(histories) if history and history[-1][1] is None]
+    if not pending:
+        return histories, galleries
+
+    questions = [histories[i][-1][0] for i in pending]
+    error = None
 
     try:
-        response = requests.post(API_URL, json={"question": user_message})
+        response = await CLIENT.post(ASK_BATCH_URL, json={"questions": questions})
         response.raise_for_status()
 
-        data = response.json()
-        text = data.get("answer", "No response received")
-        images = data.get("images", [])
-
-        # Update current images for the gallery
-        current_images = []
-        if images:
-            for image_path in images:
-                abs_path = os.path.abspath(image_path)
-                if os.path.exists(abs_path):
-                    current_images.append(abs_path)
-
-        # Always just show the text response - images will be displayed in the gallery
-        history[-1][1] = text
-
-    except requests.exceptions.ConnectionError:
-        history[-1][1] = "🔌 **Connection Error**: Cannot connect to the backend server."
-    except requests.exceptions.RequestException as e:
-        history[-1][1] = f"🌐 **Network Error**: {str(e)}"
+        results = response.json().get("results", [])
+        for position, i in enumerate(pending):
+            data = results[position] if position < len(results) else {}
+
+            # Always just show the text response - images will be displayed in the gallery
+            answer = data.get("answer", "No response received")
+            if data.get("error"):
+                answer = f"⚠️ {answer}"
+            histories[i][-1][1] = answer
+            galleries[i] = _gallery_paths(data.get("images", []))
+
+    except httpx.ConnectError:
+        error = "🔌 **Connection Error**: Cannot connect to the backend server."
+    except httpx.HTTPError as e:
+        error = f"🌐 **Network Error**: {str(e)}"
     except Exception as e:
-        history[-1][1] = f"⚠️ **Unexpected Error**: {str(e)}"
+        error = f"⚠️ **Unexpected Error**: {str(e)}"
+
+    # A transport-level failure affects every question sent in this request
+    if error is not None:
+        for i in pending:
+            histories[i][-1][1] = error
 
-    return history
+    return histories, galleries
 
 def check_backend_status():
-    """Checks if the backend server is running."""
+    """Checks if the backend server is running (result is reused for STATUS_TTL seconds)."""
+    now = monotonic()
+    if now - _STATUS_CACHE["t"] < STATUS_TTL:
+        return _STATUS_CACHE["html"]
+
     try:
-        requests.get("http://127.0.0.1:8000/docs", timeout=5)
-        return get_status_html(True, "Backend Status: Connected and running")
-    except requests.exceptions.ConnectionError:
-        return get_status_html(False, "Backend Status: Disconnected - Please start your FastAPI server")
+        SESSION.get(STATUS_URL, timeout=2)
+        html = get_status_html(True, "Backend Status: Connected and running")
+    except requests.exceptions.RequestException:
+        html = get_status_html(False, "Backend Status: Disconnected - Please start your FastAPI server")
 
-def get_current_images():
-    """Return current images for the gallery"""
-    global current_images
-    return current_images if current_images else []
+    _STATUS_CACHE.update(t=now, html=html)
+    return html
 
-# Load external CSS
-custom_css = load_css()
+# Serve the external CSS as a static file (browser-cached); inline it only if the file is missing
+css_head = get_css_head()
+custom_css = None if css_head else load_css()
 
 # Create the improved interface using gr.Blocks
 with gr.Blocks(
     css=custom_css,
+    head=css_head,
     title="📚 Multimodal RAG Assistant",
     theme=gr.themes.Soft(**get_theme_config())
 ) as demo:
@@ -136,10 +196,10 @@ with gr.Blocks(
     ).then(
         fn=get_bot_response,
         inputs=chatbot,
-        outputs=chatbot
-    ).then(
-        fn=get_current_images,
-        outputs=image_gallery
+        outputs=[chatbot, image_gallery],
+        batch=True,
+        max_batch_size=8,
+        concurrency_limit=16
     )
 
     # This handles the case where the user presses Enter in the textbox
@@ -150,10 +210,10 @@ with gr.Blocks(
     ).then(
         fn=get_bot_response,
         inputs=chatbot,
-        outputs=chatbot
-    ).then(
-        fn=get_current_images,
-        outputs=image_gallery
+        outputs=[chatbot, image_gallery],
+        batch=True,
+        max_batch_size=8,
+        concurrency_limit=16
     )
 
 if __name__ == "__main__":
@@ -165,5 +225,6 @@ if __name__ == "__main__":
         server_port=7860,
         show_api=False,
         share=False,
-        inbrowser=True
+        inbrowser=True,
+        allowed_paths=[str(CSS_PATH.parent)]
     )
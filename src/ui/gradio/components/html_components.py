@@ -2,6 +2,9 @@
 HTML templates for the Gradio interface components
 """
 
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
 def get_header_html():
     """Return the header section HTML"""
     return """
@@ -16,6 +19,7 @@ a            Indra AI Chatbot Test
     </div>
     """
 
+@lru_cache(maxsize=1)
 def get_features_html():
     """Return the features section HTML"""
     return """
@@ -29,6 +33,7 @@ def get_features_html():
     </div>
     """
 
+@lru_cache(maxsize=1)
 def get_tips_html():
     """Return the tips section HTML"""
     return """
@@ -44,6 +49,7 @@ def get_tips_html():
     </div>
     """
 
+@lru_cache(maxsize=1)
 def get_footer_html():
     """Return the footer section HTML"""
     return """
@@ -55,6 +61,7 @@ def get_footer_html():
     </div>
     """
 
+@lru_cache(maxsize=4)
 def get_status_html(is_connected: bool, message: str = ""):
     """Return the status indicator HTML with dynamic styling"""
     status_class = "status-connected" if is_connected else "status-disconnected"
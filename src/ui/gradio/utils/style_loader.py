@@ -2,12 +2,15 @@
 CSS loader and styling utilities for the Gradio interface
 """
 
-import os
+from functools import lru_cache
 from pathlib import Path
 
+CSS_PATH = Path(__file__).parent.parent.parent / "static" / "css" / "styles.css"
+
+@lru_cache(maxsize=1)
 def load_css() -> str:
-    """Load the CSS file and return its content"""
-    css_path = Path(__file__).parent.parent.parent / "static" / "css" / "styles.css"
+    """Load the CSS file and return its content (read from disk only once)"""
+    css_path = CSS_PATH
 
     try:
         with open(css_path, 'r', encoding='utf-8') as f:
@@ -21,6 +24,12 @@ def load_css() -> str:
         }
         """
 
+def get_css_head():
+    """Return a <link> tag that serves the CSS file as a cacheable static asset (None if the file is missing)"""
+    if not CSS_PATH.is_file():
+        return None
+    return f'<link rel="stylesheet" href="/gradio_api/file={CSS_PATH.resolve().as_posix()}">'
+
 def get_theme_config():
     """Return Gradio theme configuration"""
     return {
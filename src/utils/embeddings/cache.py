@@ -0,0 +1,108 @@
+"""
+Caché persistente (SQLite) de embeddings, indexada por modelo y hash del texto.
+Es opcional: EmbeddingsGenerator solo la usa si recibe un directorio de caché.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+# SQLite limita el número de parámetros por consulta; se consulta por lotes
+_SQL_BATCH_SIZE = 500
+
+
+class EmbeddingCache:
+    """
+    Caché persistente de embeddings en SQLite.
+    Cada vector se indexa por (modelo, blake2b del texto), así los chunks sin cambios
+    no se vuelven a codificar entre ejecuciones de la ingesta.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Inicializa la caché en disco.
+
+        Args:
+            cache_dir (str): Directorio de la caché (se crea si no existe)
+        """
+        self.logger = logging.getLogger(__name__)
+
+        cache_path = Path(cache_dir).expanduser()
+        cache_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_path / "embeddings.sqlite3"
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, hash BLOB NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model, hash))"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def hash_text(text: str) -> bytes:
+        """Calcula la clave de caché de un texto."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, model_name: str, hashes: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Devuelve los vectores cacheados para las claves dadas (solo los que existen)."""
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), _SQL_BATCH_SIZE):
+                batch = hashes[i:i + _SQL_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    (model_name, *batch)
+                )
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, model_name: str, hashes: List[bytes], vectors: np.ndarray):
+        """Guarda vectores en la caché."""
+        rows = [
+            (model_name, key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in zip(hashes, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def get_or_compute(self,
+                       texts: List[str],
+                       model_name: str,
+                       encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Devuelve los embeddings de los textos, codificando solo los que no están en caché.
+
+        Args:
+            texts (List[str]): Textos a codificar
+            model_name (str): Nombre del modelo (parte de la clave de caché)
+            encode_fn (Callable): Función que codifica una lista de textos
+
+        Returns:
+            np.ndarray: Embeddings en el mismo orden que texts
+        """
+        hashes = [self.hash_text(text) for text in texts]
+        cached = self.get_many(model_name, list(dict.fromkeys(hashes)))
+
+        miss_idx = [i for i, key in enumerate(hashes) if key not in cached]
+        self.logger.info(f"Caché de embeddings: {len(texts) - len(miss_idx)} aciertos, {len(miss_idx)} fallos")
+
+        if miss_idx:
+            miss_embeddings = np.asarray(encode_fn([texts[i] for i in miss_idx]), dtype=np.float32)
+            miss_hashes = [hashes[i] for i in miss_idx]
+            self.put_many(model_name, miss_hashes, miss_embeddings)
+            cached.update(zip(miss_hashes, miss_embeddings))
+
+        return np.stack([cached[key] for key in hashes]).astype(np.float32, copy=False)
@@ -1,8 +1,33 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 import logging
+import threading
+import torch
 from sentence_transformers import SentenceTransformer
 
+from .cache import EmbeddingCache
+
+
+# Modelos cargados por (nombre, dispositivo): todos los generadores comparten la misma instancia
+_MODEL_CACHE: Dict[Tuple[str, str], SentenceTransformer] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _get_model(model_name: str, device: str) -> SentenceTransformer:
+    """Carga el modelo una sola vez por (nombre, dispositivo) y lo reutiliza."""
+    key = (model_name, device)
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = SentenceTransformer(model_name, device=device)
+
+            # En GPU, FP16 reduce a la mitad el ancho de banda de memoria por forward
+            if device.startswith("cuda"):
+                model.half()
+
+            _MODEL_CACHE[key] = model
+    return model
+
 
 class EmbeddingsGenerator:
     """
@@ -10,21 +35,56 @@ class EmbeddingsGenerator:
     Maneja la creación de embeddings para texto usando modelos pre-entrenados.
     """
 
-    def __init__(self, embedding_model: str = "all-MiniLM-L6-v2"):
+    def __init__(self,
+                 embedding_model: str = "all-MiniLM-L6-v2",
+                 batch_size: int = 64,
+                 device: Optional[str] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir (str, optional): Directorio de la caché persistente de embeddings.
+                Es opcional: sin él no se crea ni se escribe ninguna base de datos en disco.
+        """
         self.embedding_model_name = embedding_model
-        self.embedding_model = SentenceTransformer(embedding_model)
+        self.batch_size = batch_size
+        self.cache = EmbeddingCache(cache_dir) if cache_dir else None
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.embedding_model = _get_model(embedding_model, self.device)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Codifica textos en lotes con embeddings normalizados (float32, como espera FAISS)."""
+        embeddings = self.embedding_model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return embeddings.astype(np.float32, copy=False)
 
     def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """Genera embeddings para una lista de textos."""
         if not texts:
             return np.array([])
 
-        embeddings = self.embedding_model.encode(texts, convert_to_numpy=True)
-        return embeddings
+        # Codificar cada texto distinto una sola vez (cabeceras/pies repetidos entre páginas)
+        unique_texts = list(dict.fromkeys(texts))
+
+        # Reutilizar embeddings ya calculados en ejecuciones anteriores
+        if self.cache is not None:
+            embeddings = self.cache.get_or_compute(unique_texts, self.embedding_model_name, self._encode)
+        else:
+            embeddings = self._encode(unique_texts)
+
+        if len(unique_texts) == len(texts):
+            return embeddings
+
+        text_to_row = {text: i for i, text in enumerate(unique_texts)}
+        return embeddings[[text_to_row[text] for text in texts]]
 
     def generate_embedding(self, text: str) -> np.ndarray:
         """Genera embedding para un solo texto."""
-        return self.embedding_model.encode([text], convert_to_numpy=True)[0]
+        return self._encode([text])[0]
 
     def get_embedding_dimension(self) -> int:
         """Retorna la dimensión de los embeddings."""
@@ -35,5 +95,7 @@ class EmbeddingsGenerator:
         return {
             "model_name": self.embedding_model_name,
             "embedding_dimension": self.get_embedding_dimension(),
-            "device": str(self.embedding_model.device)
+            "device": str(self.embedding_model.device),
+            "batch_size": self.batch_size,
+            "disk_cache": str(self.cache.db_path) if self.cache is not None else None
         }
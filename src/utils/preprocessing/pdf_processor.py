@@ -1,26 +1,272 @@
 import os
 import re
+import tempfile
+import atexit
+import multiprocessing
+import queue
 import fitz  # PyMuPDF
+import numpy as np
 from PIL import Image
-import io
-from typing import List, Dict, Any, Tuple
+from bisect import bisect_right
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
 
 from src.app.ingestion.models import ExtractedContent
 
-# Para OCR cuando el PDF no tiene texto extraíble
+# Para OCR cuando el PDF no tiene texto extraíble: tesserocr (API de C de Tesseract, en proceso)
+# si está disponible; si no, pytesseract (lanza el ejecutable de Tesseract)
+try:
+    import tesserocr
+    HAS_TESSEROCR = True
+except ImportError:
+    tesserocr = None
+    HAS_TESSEROCR = False
+
 try:
     import pytesseract
     # Configurar ruta de Tesseract en Windows
     tesseract_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
     if os.path.exists(tesseract_path):
         pytesseract.pytesseract.tesseract_cmd = tesseract_path
-    HAS_OCR = True
+    HAS_PYTESSERACT = True
 except ImportError:
     pytesseract = None
-    HAS_OCR = False
+    HAS_PYTESSERACT = False
+
+HAS_OCR = HAS_TESSEROCR or HAS_PYTESSERACT
+if not HAS_OCR:
     print("⚠️  pytesseract no está disponible. PDFs con solo imágenes no podrán procesarse con OCR.")
 
+OCR_LANGUAGES = 'eng+spa'
+
+# Numba (opcional) compila el bucle de límites de chunks a código nativo
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    njit = None
+    HAS_NUMBA = False
+
+
+# Calidad de las imágenes extraídas que se guardan como JPEG
+JPEG_QUALITY = 85
+
+# A partir de este número de páginas el procesamiento se reparte en procesos
+# (por debajo, el coste de arrancar el pool supera la ganancia)
+PROCESS_POOL_MIN_PAGES = 20
+
+# Procesos para documentos grandes: cada uno abre su propia copia del PDF
+MAX_PROCESS_WORKERS = 4
+
+# Resolución objetivo para OCR (zona óptima de Tesseract); las páginas escaneadas a menor
+# resolución se renderizan a su resolución nativa, porque escalar más no agrega información
+OCR_TARGET_DPI = 200
+OCR_MIN_DPI = 72
+
+# Páginas por invocación de Tesseract: amortiza el arranque y la carga de los modelos de idioma
+OCR_BATCH_SIZE = 8
+
+# Patrones y tablas de limpieza de texto, construidos una sola vez
+_WHITESPACE_RE = re.compile(r'\s+')
+_KEPT_PUNCTUATION = frozenset('.,!?;:-()[]"\'/')
+
+
+class _CleanTextTable(dict):
+    """
+    Tabla para str.translate que descarta todo salvo alfanuméricos, '_', espacios y la puntuación permitida.
+    Se llena de forma perezosa: cada código Unicode se evalúa una sola vez.
+    """
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        keep = char.isalnum() or char == '_' or char.isspace() or char in _KEPT_PUNCTUATION
+        value = codepoint if keep else None
+        self[codepoint] = value
+        return value
+
+
+_CLEAN_TEXT_TABLE = _CleanTextTable()
+
+# Terminadores de oración usados como puntos de corte entre chunks, como tabla de búsqueda
+# indexada por código de carácter (todos son ASCII; la entrada 255 queda en False y recoge
+# cualquier código mayor)
+_SENTENCE_TERMINATOR_TABLE = np.zeros(256, dtype=bool)
+_SENTENCE_TERMINATOR_TABLE[[ord(c) for c in '.!?\n']] = True
+
+
+def _clean_text(text: str) -> str:
+    """Limpia y normaliza el texto extraído."""
+    # Remover caracteres de control y espacios extras: un pase de regex y otro de tabla
+    text = _WHITESPACE_RE.sub(' ', text).translate(_CLEAN_TEXT_TABLE).strip()
+
+    # El colapso de espacios ya eliminó los saltos de línea, así que el texto es una sola
+    # línea: se descarta solo si es muy corto (probablemente header/footer)
+    return text if len(text) > 3 else ''
+
+
+def _chunk_bounds(terminators: List[int],
+                  text_length: int,
+                  chunk_size: int,
+                  chunk_overlap: int) -> Tuple[List[int], List[int]]:
+    """
+    Calcula los límites (inicio, fin) de cada chunk a partir de los índices ordenados
+    de los terminadores de oración. Versión en Python puro (bisect sobre una lista).
+    """
+    starts = []
+    ends = []
+    start = 0
+    min_cut_offset = chunk_size // 2
+
+    while start < text_length:
+        end = start + chunk_size
+
+        if end >= text_length:
+            starts.append(start)
+            ends.append(text_length)
+            break
+
+        # Buscar el último punto o salto de línea antes del límite (en la mitad final del chunk)
+        chunk_end = end
+        idx = bisect_right(terminators, end) - 1
+        if idx >= 0 and terminators[idx] > start + min_cut_offset:
+            chunk_end = terminators[idx] + 1
+
+        starts.append(start)
+        ends.append(chunk_end)
+        start = chunk_end - chunk_overlap
+
+    return starts, ends
+
+
+def _chunk_bounds_array(terminators: np.ndarray,
+                        text_length: int,
+                        chunk_size: int,
+                        chunk_overlap: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Igual que _chunk_bounds, sobre un array de NumPy; pensada para compilarse con Numba.
+    Requiere 0 <= chunk_overlap < chunk_size // 2 (validado en PDFPreprocessor): cada chunk
+    avanza al menos chunk_size // 2 + 2 - chunk_overlap caracteres, lo que acota max_chunks.
+    Compilada con Numba no hay comprobación de límites al escribir en el búfer.
+    """
+    max_chunks = text_length // max(1, chunk_size // 2 + 1 - chunk_overlap) + 2
+    starts = np.empty(max_chunks, dtype=np.int64)
+    ends = np.empty(max_chunks, dtype=np.int64)
+    count = 0
+    start = 0
+    min_cut_offset = chunk_size // 2
+
+    while start < text_length:
+        end = start + chunk_size
+
+        if end >= text_length:
+            starts[count] = start
+            ends[count] = text_length
+            count += 1
+            break
+
+        chunk_end = end
+        idx = np.searchsorted(terminators, end, side='right') - 1
+        if idx >= 0 and terminators[idx] > start + min_cut_offset:
+            chunk_end = terminators[idx] + 1
+
+        starts[count] = start
+        ends[count] = chunk_end
+        count += 1
+        start = chunk_end - chunk_overlap
+
+    return starts[:count], ends[:count]
+
+
+if HAS_NUMBA:
+    _chunk_bounds_array = njit(cache=True)(_chunk_bounds_array)
+
+
+def _split_text_into_chunks(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """Divide texto en chunks con solapamiento."""
+    if len(text) <= chunk_size:
+        return [text]
+
+    # Índices (en caracteres) de todos los terminadores, en un solo pase vectorizado.
+    # UTF-32 da un código por carácter, así que los índices coinciden con los del str.
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    terminators = np.flatnonzero(_SENTENCE_TERMINATOR_TABLE[np.minimum(codepoints, 255)])
+
+    # Con Numba el bucle corre compilado; sin él, bisect sobre enteros de Python
+    # evita el coste por llamada de NumPy
+    if HAS_NUMBA:
+        starts, ends = _chunk_bounds_array(terminators, len(text), chunk_size, chunk_overlap)
+        starts, ends = starts.tolist(), ends.tolist()
+    else:
+        starts, ends = _chunk_bounds(terminators.tolist(), len(text), chunk_size, chunk_overlap)
+
+    # Recortar una sola vez y filtrar en el mismo pase: todos los chunks salen ya recortados
+    stripped_chunks = (text[start:end].strip() for start, end in zip(starts, ends))
+    return [chunk for chunk in stripped_chunks if chunk]
+
+
+def _otsu_threshold(gray: np.ndarray) -> int:
+    """Calcula el umbral de Otsu de una imagen en escala de grises (uint8)."""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    weight = np.cumsum(hist)
+    cumulative_mean = np.cumsum(hist * np.arange(256))
+    total, total_mean = weight[-1], cumulative_mean[-1]
+
+    # Varianza entre clases para cada umbral posible (0 donde una clase queda vacía)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between_var = (total_mean * weight - cumulative_mean * total) ** 2 / (weight * (total - weight))
+
+    return int(np.argmax(np.nan_to_num(between_var, nan=0.0, posinf=0.0)))
+
+
+def _clean_and_split(page_text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """Limpia el texto de una página y lo divide en chunks. Función de módulo para poder enviarse a otro proceso."""
+    return _split_text_into_chunks(_clean_text(page_text), chunk_size, chunk_overlap)
+
+
+# APIs de tesserocr reutilizables: cada una carga los modelos de idioma una sola vez.
+# Una API no es thread-safe, así que cada hilo toma una del pool mientras la usa.
+_TESS_API_POOL = queue.SimpleQueue()
+
+
+def _tesserocr_image_to_text(pil_image: Image.Image) -> str:
+    """Aplica OCR en proceso con tesserocr, reutilizando una API del pool."""
+    try:
+        api = _TESS_API_POOL.get_nowait()
+    except queue.Empty:
+        api = tesserocr.PyTessBaseAPI(lang=OCR_LANGUAGES)
+
+    try:
+        api.SetImage(pil_image)
+        return api.GetUTF8Text()
+    finally:
+        _TESS_API_POOL.put(api)
+
+
+@atexit.register
+def _end_tesserocr_apis():
+    """Libera las APIs de tesserocr al terminar el proceso."""
+    while True:
+        try:
+            _TESS_API_POOL.get_nowait().End()
+        except queue.Empty:
+            break
+
+
+def load_image(image_meta: Dict[str, Any]) -> Image.Image:
+    """
+    Abre bajo demanda una imagen extraída a partir de sus metadatos.
+    Los metadatos solo guardan la ruta y el tamaño, así no se mantienen imágenes decodificadas en memoria.
+
+    Args:
+        image_meta (Dict[str, Any]): Metadatos de la imagen (con "image_path")
+
+    Returns:
+        Image.Image: Imagen PIL (se decodifica al acceder a sus píxeles)
+    """
+    return Image.open(image_meta["image_path"])
+
 
 class PDFPreprocessor:
     """
@@ -32,18 +278,29 @@ class PDFPreprocessor:
     def __init__(self,
                  chunk_size: int = 500,
                  chunk_overlap: int = 50,
-                 use_ocr: bool = True):
+                 use_ocr: bool = True,
+                 max_workers: Optional[int] = None):
         """
         Inicializa el preprocesador de PDFs.
 
         Args:
             chunk_size (int): Tamaño máximo de cada chunk de texto
-            chunk_overlap (int): Solapamiento entre chunks
+            chunk_overlap (int): Solapamiento entre chunks (0 <= chunk_overlap < chunk_size // 2)
             use_ocr (bool): Si usar OCR para PDFs con solo imágenes
+            max_workers (int, optional): Hilos para OCR en paralelo (por defecto os.cpu_count());
+                también limita los procesos usados con PDFs grandes
         """
+        # Cada chunk avanza al menos chunk_size // 2 - chunk_overlap caracteres: con un solapamiento
+        # mayor la división no avanzaría y el búfer de _chunk_bounds_array quedaría corto
+        if not 0 <= chunk_overlap < chunk_size // 2:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) debe cumplir 0 <= chunk_overlap < chunk_size // 2 ({chunk_size // 2})"
+            )
+
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.use_ocr = use_ocr and HAS_OCR
+        self.max_workers = max_workers or os.cpu_count() or 1
 
         # Configurar logging
         self.logger = logging.getLogger(__name__)
@@ -68,50 +325,36 @@ class PDFPreprocessor:
 
         self.logger.info(f"Extrayendo contenido de: {pdf_path}")
 
-        # Abrir PDF
-        doc = fitz.open(pdf_path)
-
-        # Extraer texto e imágenes
-        all_text = []
         images = []
-        page_texts = {}
-        total_text_length = 0
-
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-
-            # Extraer texto de la página
-            page_text = page.get_text()
-            total_text_length += len(page_text.strip())
-            self.logger.info(f"Texto extraído sin OCR: {page_text.strip()}")
-
-            # Si no hay texto y OCR está habilitado, intentar OCR
-            if len(page_text.strip()) == 0:
-                self.logger.info(f"Página {page_num} sin texto extraíble, intentando OCR...")
-                page_text = self._extract_text_with_ocr(page)
-                total_text_length += len(page_text.strip())
-
-            page_texts[page_num] = page_text
-            all_text.append(page_text)
+        text_chunks = []
+        metadata = []
 
-            # Extraer imágenes de la página
-            page_images = self._extract_images_from_page(page, page_num)
-            images.extend(page_images)
+        # Abrir PDF
+        doc = fitz.open(pdf_path)
+        page_count = len(doc)
 
-        doc.close()
+        if page_count >= PROCESS_POOL_MIN_PAGES:
+            # Documentos grandes: las páginas se reparten entre procesos que abren su propio documento
+            doc.close()
+            total_text_length = self._extract_pages_in_processes(pdf_path, page_count, images, text_chunks, metadata)
+        else:
+            total_text_length = self._extract_pages(doc, images, text_chunks, metadata)
+            doc.close()
 
         self.logger.info(f"Total de texto extraído: {total_text_length} caracteres")
 
+        # Agrupar imágenes por página una sola vez (las páginas llegan en orden)
+        page_to_images = defaultdict(list)
+        for img in images:
+            page_to_images[img["page"]].append(img)
+
         # Si no se extrajo texto, crear contenido básico con descripciones de imágenes
         if total_text_length == 0:
             self.logger.warning("No se pudo extraer texto del PDF. Creando contenido basado en imágenes.")
-            text_chunks, metadata = self._create_image_based_content(images)
-        else:
-            # Procesar texto en chunks
-            text_chunks, metadata = self._create_text_chunks(all_text, page_texts)
+            text_chunks, metadata = self._create_image_based_content(page_to_images)
 
         # Asociar imágenes con chunks de texto más relevantes
-        self._associate_images_with_chunks(text_chunks, images, metadata)
+        self._associate_images_with_chunks(page_to_images, metadata)
 
         self.logger.info(f"Extraídos {len(text_chunks)} chunks de texto y {len(images)} imágenes")
 
@@ -121,35 +364,267 @@ class PDFPreprocessor:
             metadata=metadata
         )
 
-    def _extract_text_with_ocr(self, page) -> str:
-        """Extrae texto de una página usando OCR."""
-        if not self.use_ocr or not HAS_OCR:
-            return ""
+    def _extract_pages(self,
+                       doc,
+                       images: List[Dict[str, Any]],
+                       text_chunks: List[str],
+                       metadata: List[Dict[str, Any]]) -> int:
+        """
+        Extrae texto e imágenes de todas las páginas en este proceso.
+        Cada página se divide en chunks en cuanto su texto está disponible,
+        así no se retiene el texto crudo de todo el documento.
+
+        Returns:
+            int: Longitud total del texto extraído
+        """
+        pending_pages = deque()
+        ocr_batch = []
+        saved_images = {}
+        total_text_length = 0
+
+        # Lotes de OCR lo bastante pequeños para que todos los hilos tengan trabajo
+        # (en el peor caso, todas las páginas necesitan OCR)
+        ocr_batch_size = min(OCR_BATCH_SIZE, max(1, -(-len(doc) // self.max_workers)))
+
+        # PyMuPDF no es thread-safe: las llamadas a fitz se hacen en este hilo y
+        # solo el OCR (subproceso de Tesseract, por lotes) se reparte en el pool de hilos.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for page_num, page in enumerate(doc.pages()):
+                page_text, page_images = self._process_page(page, page_num, ocr_batch, saved_images)
+                images.extend(page_images)
+                pending_pages.append((page_num, page_text))
+
+                if len(ocr_batch) >= ocr_batch_size:
+                    self._flush_ocr_batch(ocr_batch, executor)
+                total_text_length += self._chunk_ready_pages(pending_pages, text_chunks, metadata, wait=False)
+
+            # Lanzar el último lote y esperar los OCR pendientes, respetando el orden de páginas
+            if ocr_batch:
+                self._flush_ocr_batch(ocr_batch, executor)
+            total_text_length += self._chunk_ready_pages(pending_pages, text_chunks, metadata, wait=True)
+
+        return total_text_length
+
+    def _extract_pages_in_processes(self,
+                                    pdf_path: str,
+                                    page_count: int,
+                                    images: List[Dict[str, Any]],
+                                    text_chunks: List[str],
+                                    metadata: List[Dict[str, Any]]) -> int:
+        """
+        Extrae el contenido repartiendo rangos de páginas contiguas entre procesos.
+        Cada proceso abre su propio documento (fitz no se comparte entre procesos) y
+        devuelve solo chunks y metadatos de imágenes, sin objetos pesados que serializar.
+
+        Returns:
+            int: Longitud total del texto extraído
+        """
+        workers = min(self.max_workers, MAX_PROCESS_WORKERS)
+
+        # Varios rangos por proceso para equilibrar páginas de coste desigual (OCR)
+        shard_size = max(1, -(-page_count // (workers * 4)))
+        shards = [range(start, min(start + shard_size, page_count))
+                  for start in range(0, page_count, shard_size)]
+
+        # "spawn" y no el fork por defecto de Linux: el servicio de ingesta corre dentro de un proceso
+        # con torch/sentence-transformers cargados y hilos activos, que no es seguro bifurcar
+        total_text_length = 0
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            for shard_results in executor.map(self._process_page_range, [pdf_path] * len(shards), shards):
+                for page_num, page_text_length, page_chunks, page_images in shard_results:
+                    total_text_length += page_text_length
+                    images.extend(page_images)
+                    self._create_text_chunks(page_num, page_chunks, text_chunks, metadata)
+
+        return total_text_length
+
+    def _process_page_range(self,
+                            pdf_path: str,
+                            page_nums: range) -> List[Tuple[int, int, List[str], List[Dict[str, Any]]]]:
+        """
+        Procesa un rango de páginas en un proceso del pool: texto (con OCR si hace falta),
+        imágenes y división en chunks.
+
+        Returns:
+            Lista de (página, longitud del texto, chunks, imágenes)
+        """
+        pages = []
+        ocr_batch = []
+        saved_images = {}
+        with fitz.open(pdf_path) as doc:
+            for page_num, page in enumerate(doc.pages(page_nums.start, page_nums.stop), start=page_nums.start):
+                page_text, page_images = self._process_page(page, page_num, ocr_batch, saved_images)
+                pages.append((page_num, page_text, page_images))
+
+                if len(ocr_batch) >= OCR_BATCH_SIZE:
+                    self._flush_ocr_batch(ocr_batch)
+
+        if ocr_batch:
+            self._flush_ocr_batch(ocr_batch)
+
+        results = []
+        for page_num, page_text, page_images in pages:
+            if isinstance(page_text, Future):
+                page_text = page_text.result()
+
+            page_text_length = len(page_text)
+            page_chunks = _clean_and_split(page_text, self.chunk_size, self.chunk_overlap) if page_text_length else []
+            results.append((page_num, page_text_length, page_chunks, page_images))
+
+        return results
+
+    def _process_page(self, page, page_num: int,
+                      ocr_batch: List[Tuple[Future, Image.Image]],
+                      saved_images: Dict[int, Dict[str, Any]]) -> Tuple[Union[str, Future], List[Dict[str, Any]]]:
+        """
+        Extrae texto e imágenes de una página. El texto se devuelve ya recortado.
+        Si la página no tiene texto, su imagen se agrega al lote de OCR y se devuelve
+        un Future que se resuelve al procesar el lote (ver _flush_ocr_batch).
+        """
+        # Extraer texto de la página (recortado una sola vez; el OCR también devuelve texto recortado)
+        page_text = page.get_text().strip()
+        self.logger.debug("Texto extraído sin OCR: %.100s...", page_text)
+        needs_ocr = not page_text and self.use_ocr
+
+        # Un solo recorrido del contenido de la página, compartido por la elección de DPI
+        # del OCR y los bboxes de las imágenes (solo si alguno de los dos lo necesita)
+        image_list = page.get_images()
+        image_info = page.get_image_info(xrefs=True) if image_list or needs_ocr else []
+
+        # Solo se rasteriza la página si no hay texto y OCR está habilitado
+        if needs_ocr:
+            self.logger.info("Página %d sin texto extraíble, intentando OCR...", page_num)
+            pil_image = self._render_page_for_ocr(page, image_info)
+            if pil_image is not None:
+                page_text = Future()
+                ocr_batch.append((page_text, pil_image))
+
+        # Extraer imágenes de la página
+        page_images = self._extract_images_from_page(page, page_num, saved_images, image_list, image_info)
 
+        return page_text, page_images
+
+    def _render_page_for_ocr(self, page, image_info: Optional[List[Dict[str, Any]]] = None) -> Optional[Image.Image]:
+        """
+        Renderiza una página como imagen PIL binarizada para OCR.
+        Tesseract binariza internamente de todos modos: entregarle la imagen en gris ya
+        umbralizada (Otsu) reduce los bytes que procesa y suele mejorar el reconocimiento.
+        """
         try:
-            # Convertir página a imagen
-            mat = fitz.Matrix(2.0, 2.0)  # Aumentar resolución para mejor OCR
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
-            pil_image = Image.open(io.BytesIO(img_data))
+            # Convertir página a imagen, directamente en escala de grises
+            zoom = self._ocr_dpi(page, image_info) / 72.0
+            mat = fitz.Matrix(zoom, zoom)
+            pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+            # Vista sin copia sobre el búfer del pixmap (samples crearía una copia en bytes)
+            gray = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+
+            # Binarizar con el umbral de Otsu
+            binary = np.where(gray > _otsu_threshold(gray), 255, 0).astype(np.uint8)
+            return Image.fromarray(binary)
+
+        except Exception as e:
+            self.logger.warning(f"Error renderizando página para OCR: {e}")
+            return None
+
+    def _ocr_dpi(self, page, image_info: Optional[List[Dict[str, Any]]] = None) -> float:
+        """
+        Elige la resolución de renderizado para OCR: OCR_TARGET_DPI, salvo que la imagen
+        escaneada más grande de la página tenga menos resolución (entonces, la nativa).
+        image_info es el resultado de page.get_image_info() si el llamador ya lo tiene.
+        """
+        if image_info is None:
+            image_info = page.get_image_info()
+
+        native_dpi = 0.0
+        for info in image_info:
+            bbox_width = info["bbox"][2] - info["bbox"][0]
+            if bbox_width > 0:
+                native_dpi = max(native_dpi, info["width"] * 72.0 / bbox_width)
+
+        if native_dpi == 0.0:
+            return OCR_TARGET_DPI
+        return max(OCR_MIN_DPI, min(native_dpi, OCR_TARGET_DPI))
+
+    def _flush_ocr_batch(self,
+                         ocr_batch: List[Tuple[Future, Image.Image]],
+                         executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Aplica OCR a un lote de páginas y resuelve sus Futures.
+        Con executor, el lote se procesa en el pool de hilos; sin él, en el momento.
+        """
+        batch = list(ocr_batch)
+        ocr_batch.clear()
+
+        def run_batch():
+            texts = [""] * len(batch)
+            try:
+                texts = self._run_ocr_batch([pil_image for _, pil_image in batch])
+            finally:
+                # Resolver siempre los Futures para no bloquear a quien espera las páginas
+                for (future, _), text in zip(batch, texts):
+                    future.set_result(text)
+
+        if executor is not None:
+            executor.submit(run_batch)
+        else:
+            run_batch()
+
+    def _run_ocr_batch(self, pil_images: List[Image.Image]) -> List[str]:
+        """
+        Aplica OCR a varias imágenes en una sola invocación de Tesseract (lista de archivos PGM),
+        así el proceso y los modelos de idioma se cargan una vez por lote.
+        Si falla, recurre al OCR imagen por imagen.
+        """
+        # Con tesserocr no hay subproceso que amortizar
+        if HAS_TESSEROCR or len(pil_images) == 1:
+            return [self._run_ocr(pil_image) for pil_image in pil_images]
+
+        try:
+            with tempfile.TemporaryDirectory(prefix="indra_ocr_") as tmp_dir:
+                image_paths = []
+                for i, pil_image in enumerate(pil_images):
+                    # PGM sin comprimir: escribir es una copia directa, sin códec
+                    image_path = os.path.join(tmp_dir, f"page_{i}.pgm")
+                    pil_image.save(image_path, format="PPM")
+                    image_paths.append(image_path)
+
+                list_path = os.path.join(tmp_dir, "pages.txt")
+                with open(list_path, "w", encoding="utf-8") as f:
+                    f.write("\n".join(image_paths))
 
-            # Aplicar OCR
-            text = pytesseract.image_to_string(pil_image, lang='eng+spa')
+                output = pytesseract.image_to_string(list_path, lang=OCR_LANGUAGES)
 
-            pix = None  # Liberar memoria
+            # Tesseract separa las páginas con un salto de página (\f)
+            texts = output.split("\f")
+            if len(texts) < len(pil_images):
+                raise ValueError(f"se esperaban {len(pil_images)} páginas y se obtuvieron {len(texts)}")
 
+            return [text.strip() for text in texts[:len(pil_images)]]
+
+        except Exception as e:
+            self.logger.warning(f"Error en OCR por lotes, procesando imágenes una a una: {e}")
+            return [self._run_ocr(pil_image) for pil_image in pil_images]
+
+    def _run_ocr(self, pil_image: Image.Image) -> str:
+        """Aplica OCR a una imagen. Seguro para ejecutarse en un hilo del pool."""
+        try:
+            if HAS_TESSEROCR:
+                text = _tesserocr_image_to_text(pil_image)
+            else:
+                text = pytesseract.image_to_string(pil_image, lang=OCR_LANGUAGES)
             return text.strip()
 
         except Exception as e:
             self.logger.warning(f"Error en OCR: {e}")
             return ""
 
-    def _create_image_based_content(self, images: List[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]]]:
-        """Crea contenido de texto basado en las imágenes cuando no hay texto extraíble."""
+    def _create_image_based_content(self,
+                                    page_to_images: Dict[int, List[Dict[str, Any]]]) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Crea contenido de texto basado en las imágenes (agrupadas por página) cuando no hay texto extraíble."""
         chunks = []
         metadata = []
 
-        if not images:
+        if not page_to_images:
             # Si no hay imágenes ni texto, crear contenido mínimo
             chunks = ["Este es un documento PDF que no contiene texto extraíble ni imágenes procesables."]
             metadata = [{
@@ -161,16 +636,8 @@ class PDFPreprocessor:
             }]
             return chunks, metadata
 
-        # Agrupar imágenes por página
-        pages_with_images = {}
-        for img in images:
-            page_num = img["page"]
-            if page_num not in pages_with_images:
-                pages_with_images[page_num] = []
-            pages_with_images[page_num].append(img)
-
         # Crear un chunk por página que contiene imágenes
-        for page_num, page_images in pages_with_images.items():
+        for page_num, page_images in page_to_images.items():
             chunk_text = f"Página {page_num + 1} contiene {len(page_images)} imagen(es). "
             chunk_text += f"Esta página forma parte de un documento PDF con contenido visual. "
             chunk_text += f"Las imágenes pueden contener información importante como gráficos, diagramas, o texto escaneado."
@@ -186,43 +653,72 @@ class PDFPreprocessor:
 
         return chunks, metadata
 
-    def _extract_images_from_page(self, page, page_num: int) -> List[Dict[str, Any]]:
-        """Extrae todas las imágenes de una página específica."""
+    def _extract_images_from_page(self, page, page_num: int,
+                                  saved_images: Optional[Dict[int, Dict[str, Any]]] = None,
+                                  image_list: Optional[List[tuple]] = None,
+                                  image_info: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Extrae todas las imágenes de una página específica.
+        saved_images (xref -> archivo guardado) se comparte entre páginas del mismo documento:
+        una imagen repetida (logos, fondos) se decodifica y guarda una sola vez.
+        image_list/image_info son page.get_images() y page.get_image_info(xrefs=True) si el
+        llamador ya los calculó.
+        """
+        if saved_images is None:
+            saved_images = {}
+
         images = []
-        image_list = page.get_images()
+        if image_list is None:
+            image_list = page.get_images()
+        if not image_list:
+            return images
+
+        if image_info is None:
+            image_info = page.get_image_info(xrefs=True)
+
+        # Bboxes de todas las imágenes en un solo recorrido del contenido de la página
+        bbox_by_xref = {}
+        for info in image_info:
+            bbox_by_xref.setdefault(info["xref"], info["bbox"])
 
         for img_index, img in enumerate(image_list):
             try:
-                # Obtener datos de la imagen
                 xref = img[0]
-                pix = fitz.Pixmap(page.parent, xref)
+                saved = saved_images.get(xref)
 
-                # Convertir a PIL Image
-                if pix.n - pix.alpha < 4:  # Solo RGB o escala de grises
-                    img_data = pix.tobytes("png")
-                    pil_image = Image.open(io.BytesIO(img_data))
+                if saved is None:
+                    # Obtener datos de la imagen
+                    pix = fitz.Pixmap(page.parent, xref)
 
-                    # Guardar imagen en disco
-                    img_filename = f"page_{page_num}_img_{img_index}.png"
+                    # PNG/JPEG solo admiten gris o RGB: convertir (p. ej. CMYK) solo cuando hace falta
+                    if pix.n - pix.alpha >= 4:
+                        pix = fitz.Pixmap(fitz.csRGB, pix)
+
+                    # Guardar directamente con el codificador nativo de MuPDF (sin pasar por PIL);
+                    # las imágenes a color sin transparencia ocupan mucho menos en JPEG
+                    use_jpeg = pix.alpha == 0 and pix.n >= 3
+                    img_filename = f"page_{page_num}_img_{img_index}.{'jpg' if use_jpeg else 'png'}"
                     img_path = os.path.join(self.images_dir, img_filename)
-                    pil_image.save(img_path)
+                    if use_jpeg:
+                        pix.save(img_path, jpg_quality=JPEG_QUALITY)
+                    else:
+                        pix.save(img_path)
+
+                    saved = {"image_path": img_path, "filename": img_filename, "size": (pix.width, pix.height)}
+                    saved_images[xref] = saved
 
-                    # Intentar obtener bbox de la imagen en la página
-                    try:
-                        bbox = page.get_image_bbox(img)
-                    except:
-                        bbox = (0, 0, pil_image.width, pil_image.height)
+                size = saved["size"]
 
-                    images.append({
-                        "image": pil_image,
-                        "page": page_num,
-                        "bbox": bbox,
-                        "image_path": img_path,
-                        "filename": img_filename,
-                        "size": pil_image.size
-                    })
+                # Bbox de la imagen en la página (o la imagen completa si no aparece)
+                bbox = bbox_by_xref.get(xref, (0, 0, size[0], size[1]))
 
-                pix = None  # Liberar memoria
+                images.append({
+                    "page": page_num,
+                    "bbox": bbox,
+                    "image_path": saved["image_path"],
+                    "filename": saved["filename"],
+                    "size": size
+                })
 
             except Exception as e:
                 self.logger.warning(f"Error extrayendo imagen {img_index} de página {page_num}: {e}")
@@ -230,95 +726,83 @@ class PDFPreprocessor:
 
         return images
 
-    def _create_text_chunks(self, all_text: List[str], page_texts: Dict[int, str]) -> Tuple[List[str], List[Dict[str, Any]]]:
-        """Divide el texto en chunks manejables con metadatos."""
-        chunks = []
-        metadata = []
-
-        for page_num, page_text in page_texts.items():
-            if not page_text.strip():
-                continue
+    def _chunk_ready_pages(self,
+                           pending_pages: deque,
+                           chunks: List[str],
+                           metadata: List[Dict[str, Any]],
+                           wait: bool) -> int:
+        """
+        Divide en chunks las páginas pendientes cuyo texto ya está disponible, en orden de página.
+        Se detiene en el primer OCR sin terminar salvo que wait sea True.
 
-            # Limpiar texto
-            cleaned_text = self._clean_text(page_text)
+        Returns:
+            int: Longitud total del texto procesado
+        """
+        text_length = 0
 
-            # Dividir en chunks
-            page_chunks = self._split_text_into_chunks(cleaned_text)
+        while pending_pages:
+            page_num, page_text = pending_pages[0]
+            if isinstance(page_text, Future):
+                if not wait and not page_text.done():
+                    break
+                page_text = page_text.result()
 
-            for chunk_idx, chunk in enumerate(page_chunks):
-                if len(chunk.strip()) < 50:  # Ignorar chunks muy cortos
-                    continue
+            pending_pages.popleft()
+            page_text_length = len(page_text)
+            if page_text_length == 0:
+                continue
 
-                chunks.append(chunk)
-                metadata.append({
-                    "page_number": page_num,
-                    "chunk_id": f"page_{page_num}_chunk_{chunk_idx}",
-                    "chunk_index": chunk_idx,
-                    "total_chunks_in_page": len(page_chunks),
-                    "associated_images": []  # Se llenará después
-                })
+            text_length += page_text_length
+            self._create_text_chunks(
+                page_num, _clean_and_split(page_text, self.chunk_size, self.chunk_overlap), chunks, metadata
+            )
+
+        return text_length
+
+    def _create_text_chunks(self,
+                            page_num: int,
+                            page_chunks: List[str],
+                            chunks: List[str],
+                            metadata: List[Dict[str, Any]]):
+        """Agrega los chunks de una página con sus metadatos."""
+        for chunk_idx, chunk in enumerate(page_chunks):
+            if len(chunk) < 50:  # Ignorar chunks muy cortos (ya vienen recortados)
+                continue
 
-                self.logger.info(f"Chunk creado: {metadata[-1]['chunk_id']} (Página {page_num}, Índice {chunk_idx})")
+            chunks.append(chunk)
+            metadata.append({
+                "page_number": page_num,
+                "chunk_id": f"page_{page_num}_chunk_{chunk_idx}",
+                "chunk_index": chunk_idx,
+                "total_chunks_in_page": len(page_chunks),
+                "associated_images": []  # Se llenará después
+            })
 
-        return chunks, metadata
+            self.logger.debug("Chunk creado: %s (Página %d, Índice %d)", metadata[-1]["chunk_id"], page_num, chunk_idx)
 
     def _clean_text(self, text: str) -> str:
         """Limpia y normaliza el texto extraído."""
-        # Remover caracteres de control y espacios extras
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\"\'\/]', '', text)
-
-        # Remover líneas muy cortas (probablemente headers/footers)
-        lines = text.split('\n')
-        cleaned_lines = [line.strip() for line in lines if len(line.strip()) > 3]
-
-        return '\n'.join(cleaned_lines).strip()
+        return _clean_text(text)
 
     def _split_text_into_chunks(self, text: str) -> List[str]:
         """Divide texto en chunks con solapamiento."""
-        if len(text) <= self.chunk_size:
-            return [text]
-
-        chunks = []
-        start = 0
-
-        while start < len(text):
-            end = start + self.chunk_size
-
-            if end >= len(text):
-                chunks.append(text[start:])
-                break
-
-            # Buscar el último punto o salto de línea antes del límite
-            chunk_end = end
-            for i in range(end, start + self.chunk_size // 2, -1):
-                if text[i] in '.!?\n':
-                    chunk_end = i + 1
-                    break
-
-            chunks.append(text[start:chunk_end].strip())
-            start = chunk_end - self.chunk_overlap
-
-        return [chunk for chunk in chunks if chunk.strip()]
+        return _split_text_into_chunks(text, self.chunk_size, self.chunk_overlap)
 
     def _associate_images_with_chunks(self,
-                                    text_chunks: List[str],
-                                    images: List[Dict[str, Any]],
+                                    page_to_images: Dict[int, List[Dict[str, Any]]],
                                     metadata: List[Dict[str, Any]]):
-        """Asocia imágenes con chunks de texto basándose en la página."""
-        # Crear mapeo de página a imágenes
-        page_to_images = {}
-        for img in images:
-            page_num = img["page"]
-            if page_num not in page_to_images:
-                page_to_images[page_num] = []
-            page_to_images[page_num].append(img)
+        """
+        Asocia imágenes con chunks de texto basándose en la página.
+        Cada chunk guarda solo las rutas de las imágenes, en una tupla inmutable compartida por página.
+        """
+        page_to_paths = {
+            page_num: tuple(img["image_path"] for img in page_images)
+            for page_num, page_images in page_to_images.items()
+        }
 
         # Asociar imágenes con chunks de la misma página
-        for i, meta in enumerate(metadata):
-            page_num = meta["page_number"]
-            if page_num in page_to_images:
-                meta["associated_images"] = page_to_images[page_num]
+        for meta in metadata:
+            meta["associated_images"] = page_to_paths.get(meta["page_number"], ())
 
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estadísticas del preprocessor."""
@@ -327,5 +811,7 @@ class PDFPreprocessor:
             "chunk_overlap": self.chunk_overlap,
             "use_ocr": self.use_ocr,
             "has_ocr": HAS_OCR,
+            "ocr_backend": "tesserocr" if HAS_TESSEROCR else ("pytesseract" if HAS_PYTESSERACT else None),
+            "max_workers": self.max_workers,
             "images_directory": self.images_dir
         }
@@ -2,7 +2,7 @@
 
 # Iniciar FastAPI en segundo plano
 echo "Iniciando backend FastAPI..."
-uvicorn src.main:app --host 0.0.0.0 --port 8000 &
+uvicorn src.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools &
 
 # Esperar un momento para que FastAPI se inicie
 sleep 10
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pruebas del endpoint /chatbot/ask_batch: validación por pregunta, mapeo de errores
+parciales y fallback cuando el servicio falla.
+"""
+
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Agregar el directorio src al path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.app.chatbot.controller import router
+from src.app.chatbot.service import get_chatbot_service
+
+
+class FakeChatbotService:
+    """Sustituye a ChatbotService: registra los lotes recibidos y responde con un eco."""
+
+    def __init__(self, answer_fn=None, error=None):
+        self.calls = []
+        self.answer_fn = answer_fn or _echo_answer
+        self.error = error
+
+    def answer_user_questions(self, questions):
+        self.calls.append(list(questions))
+        if self.error is not None:
+            raise self.error
+        return [self.answer_fn(question) for question in questions]
+
+
+def _echo_answer(question):
+    return {
+        "success": True,
+        "answer": f"Respuesta a: {question}",
+        "question": question,
+        "sources": [],
+        "images": [],
+    }
+
+
+def _client(service):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_chatbot_service] = lambda: service
+    return TestClient(app)
+
+
+def test_ask_batch_mixed_batch_fails_only_bad_items():
+    """Una pregunta vacía o demasiado larga no rechaza el lote: solo su resultado falla."""
+    service = FakeChatbotService()
+    questions = ["¿Qué es RAG?", "", "x" * 501, "   ", "¿Qué es FAISS?"]
+
+    response = _client(service).post("/chatbot/ask_batch", json={"questions": questions})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["success"] for result in results] == [True, False, False, False, True]
+    assert results[0]["answer"] == "Respuesta a: ¿Qué es RAG?"
+    assert results[4]["answer"] == "Respuesta a: ¿Qué es FAISS?"
+    assert results[1]["error"] == "La pregunta no puede estar vacía"
+    assert results[2]["error"] == "La pregunta no puede superar los 500 caracteres"
+    assert results[3]["error"] == "La pregunta no puede estar vacía"
+    # Al servicio solo le llegan las preguntas válidas
+    assert service.calls == [["¿Qué es RAG?", "¿Qué es FAISS?"]]
+
+
+def test_ask_batch_service_error_marks_pending_items():
+    """Si el servicio lanza, cada pregunta enviada recibe un error y las inválidas conservan el suyo."""
+    service = FakeChatbotService(error=RuntimeError("LLM caído"))
+
+    response = _client(service).post("/chatbot/ask_batch", json={"questions": ["¿Qué es RAG?", "", "¿Y FAISS?"]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["success"] for result in results] == [False, False, False]
+    assert results[0]["error"] == "Error interno del servidor: LLM caído"
+    assert results[1]["error"] == "La pregunta no puede estar vacía"
+    assert results[2]["error"] == "Error interno del servidor: LLM caído"
+    assert [result["question"] for result in results] == ["¿Qué es RAG?", "", "¿Y FAISS?"]
+
+
+def test_ask_batch_invalid_service_answer_is_per_item():
+    """Una respuesta del servicio que no cumple ChatbotResponse solo invalida su posición."""
+    def answer_fn(question):
+        if question == "rota":
+            return {"success": True, "question": question}  # Falta "answer"
+        return _echo_answer(question)
+
+    service = FakeChatbotService(answer_fn=answer_fn)
+
+    response = _client(service).post("/chatbot/ask_batch", json={"questions": ["¿Qué es RAG?", "rota"]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["success"] is True
+    assert results[1]["success"] is False
+    assert results[1]["error"] == "Respuesta inválida del servicio"
+    assert results[1]["question"] == "rota"
+
+
+@pytest.mark.parametrize("questions", [[], ["¿Qué es RAG?"] * 17])
+def test_ask_batch_rejects_batch_size_out_of_bounds(questions):
+    """Los límites del lote (1 a 16 preguntas) sí se validan a nivel de petición."""
+    service = FakeChatbotService()
+
+    response = _client(service).post("/chatbot/ask_batch", json={"questions": questions})
+
+    assert response.status_code == 422
+    assert service.calls == []
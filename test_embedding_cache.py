@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la caché persistente de embeddings: aciertos/fallos y orden de los resultados.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.embeddings.cache import EmbeddingCache
+
+
+MODEL_NAME = "test-model"
+
+
+class FakeEncoder:
+    """Codificador determinista que registra los textos que recibe en cada llamada."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32)
+
+
+def _expected(texts):
+    return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32)
+
+
+def test_get_or_compute_encodes_only_misses(tmp_path):
+    """La primera llamada codifica todo; la segunda solo los textos nuevos."""
+    cache = EmbeddingCache(str(tmp_path))
+    encoder = FakeEncoder()
+
+    cache.get_or_compute(["alpha", "beta"], MODEL_NAME, encoder)
+    assert encoder.calls == [["alpha", "beta"]]
+
+    cache.get_or_compute(["beta", "gamma", "alpha"], MODEL_NAME, encoder)
+    assert encoder.calls == [["alpha", "beta"], ["gamma"]]
+
+
+def test_get_or_compute_preserves_input_order(tmp_path):
+    """Los embeddings vuelven en el orden de entrada, mezclando aciertos y fallos."""
+    cache = EmbeddingCache(str(tmp_path))
+    encoder = FakeEncoder()
+    cache.get_or_compute(["bb", "dddd"], MODEL_NAME, encoder)
+
+    texts = ["a", "bb", "ccc", "dddd", "bb"]
+    embeddings = cache.get_or_compute(texts, MODEL_NAME, encoder)
+
+    assert embeddings.dtype == np.float32
+    np.testing.assert_array_equal(embeddings, _expected(texts))
+
+
+def test_get_or_compute_persists_across_instances(tmp_path):
+    """Otra instancia sobre el mismo directorio reutiliza los vectores guardados."""
+    EmbeddingCache(str(tmp_path)).get_or_compute(["alpha"], MODEL_NAME, FakeEncoder())
+
+    encoder = FakeEncoder()
+    embeddings = EmbeddingCache(str(tmp_path)).get_or_compute(["alpha"], MODEL_NAME, encoder)
+
+    assert encoder.calls == []
+    np.testing.assert_array_equal(embeddings, _expected(["alpha"]))
+
+
+def test_get_or_compute_keys_by_model(tmp_path):
+    """El mismo texto con otro modelo es un fallo de caché."""
+    cache = EmbeddingCache(str(tmp_path))
+    encoder = FakeEncoder()
+
+    cache.get_or_compute(["alpha"], MODEL_NAME, encoder)
+    cache.get_or_compute(["alpha"], "other-model", encoder)
+
+    assert encoder.calls == [["alpha"], ["alpha"]]
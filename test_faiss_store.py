@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Pruebas del vector store FAISS: búsqueda por lotes frente a búsquedas individuales
+y persistencia en disco (sidecar JSON actual y formato pickle anterior).
+"""
+
+import os
+import pickle
+import sys
+
+import faiss
+import numpy as np
+import pytest
+
+# Agregar el directorio src al path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.database.core_faiss import FAISSVectorStore
+
+
+DIMENSION = 16
+
+
+def _build_store(index_type: str = "flat", n_chunks: int = 20) -> FAISSVectorStore:
+    """Vector store con embeddings aleatorios reproducibles y metadatos por página."""
+    rng = np.random.default_rng(0)
+    store = FAISSVectorStore(dimension=DIMENSION, index_type=index_type)
+    store.add_embeddings(
+        embeddings=rng.standard_normal((n_chunks, DIMENSION)).astype(np.float32),
+        text_chunks=[f"chunk {i}" for i in range(n_chunks)],
+        metadata=[
+            {"chunk_id": f"chunk_{i}", "page_number": i // 4, "chunk_index": i}
+            for i in range(n_chunks)
+        ],
+    )
+    return store
+
+
+def _queries(n_queries: int = 5) -> np.ndarray:
+    return np.random.default_rng(1).standard_normal((n_queries, DIMENSION)).astype(np.float32)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ip", "hnsw"])
+@pytest.mark.parametrize("return_metadata", [True, False])
+def test_search_batch_matches_search_per_query(index_type, return_metadata):
+    """search_batch devuelve lo mismo que llamar a search con cada consulta."""
+    store = _build_store(index_type)
+    queries = _queries()
+
+    # search normaliza el query en el propio array: cada llamada recibe su copia
+    batch_distances, batch_results = store.search_batch(queries.copy(), k=3, return_metadata=return_metadata)
+
+    assert len(batch_distances) == len(batch_results) == len(queries)
+    for query, row_distances, row_results in zip(queries, batch_distances, batch_results):
+        distances, results = store.search(query.copy(), k=3, return_metadata=return_metadata)
+        np.testing.assert_allclose(row_distances, distances, rtol=1e-5)
+        assert [result["id"] for result in row_results] == [result["id"] for result in results]
+        assert row_results[0].keys() == results[0].keys()
+
+
+def test_search_batch_skips_missing_neighbours():
+    """Con k mayor que el número de vectores, las posiciones -1 de FAISS no generan resultados."""
+    store = _build_store(n_chunks=2)
+
+    _, batch_results = store.search_batch(_queries(2), k=5)
+
+    assert [len(results) for results in batch_results] == [2, 2]
+
+
+def _assert_same_store(loaded: FAISSVectorStore, original: FAISSVectorStore):
+    """El store cargado tiene los mismos mapeos y devuelve las mismas búsquedas."""
+    assert loaded.id_to_index == original.id_to_index
+    assert all(isinstance(doc_id, int) for doc_id in loaded.id_to_index)
+    assert loaded.metadata == original.metadata
+    assert loaded.next_id == original.next_id
+    assert loaded.dimension == original.dimension
+    assert loaded.index_type == original.index_type
+    assert loaded.get_by_id(3) == original.get_by_id(3)
+
+    queries = _queries()
+    loaded_distances, loaded_results = loaded.search_batch(queries.copy(), k=3)
+    original_distances, original_results = original.search_batch(queries.copy(), k=3)
+    np.testing.assert_allclose(loaded_distances, original_distances, rtol=1e-5)
+    assert loaded_results == original_results
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_save_load_roundtrip(tmp_path, index_type):
+    """save_index escribe el sidecar JSON y load_index recupera las claves enteras de id_to_index."""
+    store = _build_store(index_type)
+    filepath = str(tmp_path / "rag_index")
+
+    store.save_index(filepath)
+    assert os.path.exists(f"{filepath}_metadata.json")
+    assert not os.path.exists(f"{filepath}_metadata.pkl")
+
+    loaded = FAISSVectorStore(dimension=DIMENSION, index_type=index_type)
+    loaded.load_index(filepath)
+
+    _assert_same_store(loaded, store)
+
+
+def test_load_legacy_pickle_metadata(tmp_path):
+    """Un índice guardado con el formato anterior (sidecar pickle) se sigue pudiendo cargar."""
+    store = _build_store()
+    filepath = str(tmp_path / "rag_index")
+
+    # Formato anterior: mismo diccionario de metadatos, serializado con pickle
+    faiss.write_index(store.index, f"{filepath}.faiss")
+    with open(f"{filepath}_metadata.pkl", "wb") as f:
+        pickle.dump({
+            "metadata": store.metadata,
+            "id_to_index": store.id_to_index,
+            "next_id": store.next_id,
+            "dimension": store.dimension,
+            "index_type": store.index_type
+        }, f)
+
+    loaded = FAISSVectorStore(dimension=DIMENSION)
+    loaded.load_index(filepath)
+
+    _assert_same_store(loaded, store)
@@ -6,65 +6,156 @@ Incluye diagnóstico detallado para identificar problemas en la extracción de c
 
 import sys
 import os
+import mmap
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 
 # Agregar la ruta src al path para importar los módulos
 sys.path.append(str(Path(__file__).parent / "src"))
 
-from src.ingestion.service import create_ingestion_service
-from src.utils.preprocess import PDFPreprocessor
+from src.app.ingestion.service import create_ingestion_service
+from src.utils.preprocessing.pdf_processor import (
+    PDFPreprocessor,
+    PROCESS_POOL_MIN_PAGES,
+    MAX_PROCESS_WORKERS
+)
 import fitz  # PyMuPDF
 import json
 
+logger = logging.getLogger(__name__)
 
-def diagnose_pdf_content(pdf_path: str):
-    """
-    Diagnostica el contenido del PDF para identificar problemas de extracción.
-    """
-    print(f"🔍 Diagnosticando PDF: {pdf_path}")
+# Detalle por página del diagnóstico (muestras de texto incluidas) solo con VERBOSE=1
+VERBOSE = os.environ.get("VERBOSE") == "1"
 
-    try:
-        # Abrir PDF directamente con PyMuPDF
-        doc = fitz.open(pdf_path)
-        print(f"   📚 PDF abierto exitosamente")
-        print(f"   📄 Total de páginas: {len(doc)}")
 
-        total_text_length = 0
-        total_images = 0
+def setup_logging():
+    """Configurar logging para el test."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
 
-        for page_num in range(min(3, len(doc))):  # Revisar primeras 3 páginas
-            page = doc[page_num]
-            page_text = page.get_text()
-            page_images = page.get_images()
 
-            print(f"   📄 Página {page_num + 1}:")
-            print(f"      Longitud de texto: {len(page_text)} caracteres")
-            print(f"      Número de imágenes: {len(page_images)}")
-            print(f"      Muestra de texto: {repr(page_text[:100])}")
+@contextmanager
+def _open_pdf_mmap(pdf_path: str) -> Iterator[fitz.Document]:
+    """Abre el PDF sobre un mmap de solo lectura: se comparte la caché de páginas del SO sin copiar el archivo."""
+    with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        view = memoryview(buf)
+        doc = fitz.open(stream=view, filetype="pdf")
+        try:
+            yield doc
+        finally:
+            # El documento conserva la vista: cerrarlo y liberarla antes de cerrar el mmap
+            doc.close()
+            view.release()
 
-            total_text_length += len(page_text)
-            total_images += len(page_images)
 
-        doc.close()
+def _diagnose_pages(doc: fitz.Document,
+                    start: int,
+                    end: int,
+                    stop_when_conclusive: bool = False) -> List[Tuple[int, int, str]]:
+    """
+    Devuelve (longitud de texto, número de imágenes, muestra de texto) de las páginas [start, end).
+    Con stop_when_conclusive se detiene en cuanto ya se vio texto e imágenes: el diagnóstico no cambia.
+    """
+    page_stats = []
+    has_text = has_images = False
+    # Iterador nativo de PyMuPDF: carga cada página en secuencia, solo las del rango
+    for page in doc.pages(start, end):
+        page_text = page.get_text()
+        # get_images solo lee los recursos de la página, sin interpretar su contenido
+        image_count = len(page.get_images())
+        # La muestra solo se muestra en modo VERBOSE; sin él no se corta ni se escapa el texto
+        text_sample = page_text[:100].encode("unicode_escape").decode("ascii") if VERBOSE else ""
+        page_stats.append((len(page_text), image_count, text_sample))
+
+        has_text = has_text or bool(page_text)
+        has_images = has_images or image_count > 0
+        if stop_when_conclusive and has_text and has_images:
+            break
+    return page_stats
+
+
+def _diagnose_page_range(pdf_path: str, start: int, end: int) -> List[Tuple[int, int, str]]:
+    """Worker de proceso: fitz.Document no es serializable, cada worker abre su propio documento."""
+    with _open_pdf_mmap(pdf_path) as doc:
+        return _diagnose_pages(doc, start, end)
+
+
+def diagnose_pdf_content(pdf_path: str, sample_pages: Optional[int] = 3):
+    """
+    Diagnostica el contenido del PDF para identificar problemas de extracción.
+    El detalle por página solo se genera con VERBOSE=1; la salida se escribe de una vez al final.
 
-        print(f"   📊 Resumen:")
-        print(f"      Total caracteres de texto: {total_text_length}")
-        print(f"      Total imágenes: {total_images}")
+    Args:
+        pdf_path (str): Ruta del PDF
+        sample_pages (int, optional): Páginas iniciales a revisar (None revisa el documento completo)
+    """
+    msgs = [f"🔍 Diagnosticando PDF: {pdf_path}"]
+
+    try:
+        # Abrir PDF directamente con PyMuPDF
+        with _open_pdf_mmap(pdf_path) as doc:
+            msgs.append(f"   📚 PDF abierto exitosamente")
+            msgs.append(f"   📄 Total de páginas: {len(doc)}")
+
+            n_pages = len(doc) if sample_pages is None else min(sample_pages, len(doc))
+            use_processes = n_pages >= PROCESS_POOL_MIN_PAGES
+
+            if not use_processes:
+                page_stats = _diagnose_pages(doc, 0, n_pages, stop_when_conclusive=True)
+
+        if use_processes:
+            # Documentos grandes: rangos de páginas contiguos repartidos entre procesos
+            max_workers = min(os.cpu_count() or 1, MAX_PROCESS_WORKERS)
+            pages_per_worker = -(-n_pages // max_workers)
+            starts = range(0, n_pages, pages_per_worker)
+            ends = [min(start + pages_per_worker, n_pages) for start in starts]
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                page_stats = [
+                    stats
+                    for shard in executor.map(_diagnose_page_range, repeat(pdf_path), starts, ends)
+                    for stats in shard
+                ]
+        elif len(page_stats) < n_pages:
+            msgs.append(f"   ⏩ Muestreo detenido en la página {len(page_stats)}: ya hay texto e imágenes")
+
+        total_text_length = sum(text_length for text_length, _, _ in page_stats)
+        total_images = sum(image_count for _, image_count, _ in page_stats)
+
+        if VERBOSE:
+            for page_num, (text_length, image_count, text_sample) in enumerate(page_stats):
+                msgs.append(f"   📄 Página {page_num + 1}:")
+                msgs.append(f"      Longitud de texto: {text_length} caracteres")
+                msgs.append(f"      Número de imágenes: {image_count}")
+                msgs.append(f"      Muestra de texto: {text_sample}")
+
+        msgs.append(f"   📊 Resumen:")
+        msgs.append(f"      Total caracteres de texto: {total_text_length}")
+        msgs.append(f"      Total imágenes: {total_images}")
 
         if total_text_length == 0 and total_images == 0:
-            print("   ❌ PROBLEMA: El PDF no contiene texto extraíble ni imágenes")
+            msgs.append("   ❌ PROBLEMA: El PDF no contiene texto extraíble ni imágenes")
             return False
         elif total_text_length == 0:
-            print("   ✅ PDF de solo imágenes detectado - se usará procesamiento basado en imágenes")
+            msgs.append("   ✅ PDF de solo imágenes detectado - se usará procesamiento basado en imágenes")
         else:
-            print("   ✅ PDF con texto extraíble detectado")
+            msgs.append("   ✅ PDF con texto extraíble detectado")
 
         return True
 
     except Exception as e:
-        print(f"   ❌ Error al diagnosticar PDF: {str(e)}")
+        msgs.append(f"   ❌ Error al diagnosticar PDF: {str(e)}")
         return False
 
+    finally:
+        sys.stdout.write("\n".join(msgs) + "\n")
+
 
 def test_pdf_processor_directly():
     """
@@ -93,8 +184,7 @@ def test_pdf_processor_directly():
 
     except Exception as e:
         print(f"   ❌ Error en PDFPreprocessor: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Fallo en PDFPreprocessor")
         return None
 
 
@@ -132,9 +222,9 @@ def test_normalized_pipeline():
         print("📦 Creando servicio de ingesta...")
         service = create_ingestion_service()
 
-        # Procesar el PDF
+        # Procesar el PDF reutilizando el contenido ya extraído (sin segunda pasada de PyMuPDF)
         print(f"📄 Procesando PDF con servicio completo: {pdf_path}")
-        result = service.transform_pdf_to_embeddings(pdf_path)
+        result = service.transform_pdf_to_embeddings(pdf_path, content=content)
 
         # Verificar resultados
         if result["success"]:
@@ -177,8 +267,7 @@ def test_normalized_pipeline():
 
     except Exception as e:
         print(f"❌ Error inesperado: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Fallo inesperado en el pipeline normalizado")
         return False
 
 
@@ -194,20 +283,20 @@ def test_search(service):
         # Generar embedding de la consulta
         query_embedding = service.embeddings_generator.generate_embeddings([test_query])
 
-        # Buscar en el vector store
-        distances, results = service.vector_store.search(
-            query_embedding[0],
-            k=3,
-            return_metadata=True
-        )
-
-        print(f"   📋 Resultados encontrados: {len(results)}")
-        for i, result in enumerate(results):
-            print(f"      {i+1}. ID: {result['id']}")
-            print(f"         Similitud: {result.get('similarity', 'N/A'):.3f}")
-            print(f"         Página: {result.get('page_number', 'N/A')}")
-            print(f"         Imágenes asociadas: {result.get('associated_images', 0)}")
-            print(f"         Texto: {result['text'][:100]}...")
+        # Buscar en el vector store: solo (distancias, índices), sin armar metadatos
+        vector_store = service.vector_store
+        distances, indices = vector_store.search_ids_only(query_embedding, k=3)
+
+        hits = [(distance, idx) for distance, idx in zip(distances[0], indices[0]) if idx != -1]
+        print(f"   📋 Resultados encontrados: {len(hits)}")
+        for i, (distance, idx) in enumerate(hits):
+            # Hidratar los metadatos solo de los resultados que se muestran
+            meta = vector_store.metadata[idx]
+            print(f"      {i+1}. ID: {meta['id']}")
+            print(f"         Similitud: {vector_store.distance_to_similarity(distance):.3f}")
+            print(f"         Página: {meta.get('page_number', 'N/A')}")
+            print(f"         Imágenes asociadas: {meta.get('associated_images', 0)}")
+            print(f"         Texto: {meta['text'][:100]}...")
             print()
 
     except Exception as e:
@@ -216,6 +305,8 @@ def test_search(service):
 
 def main():
     """Función principal"""
+    setup_logging()
+
     print("=" * 70)
     print("🧪 TEST: Pipeline Normalizado Service ↔ FAISS (Versión Mejorada)")
     print("=" * 70)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Pruebas del PDFPreprocessor: la extracción repartida en procesos por rangos de páginas
+produce los mismos chunks que la extracción secuencial.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.preprocessing import pdf_processor
+from src.utils.preprocessing.pdf_processor import PDFPreprocessor
+
+
+PDF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "data", "rag-challenge.pdf")
+
+
+def _extract(min_pages: int, monkeypatch):
+    monkeypatch.setattr(pdf_processor, "PROCESS_POOL_MIN_PAGES", min_pages)
+    # El PDF de ejemplo es escaneado: con Tesseract disponible se comparan los chunks de OCR
+    return PDFPreprocessor(max_workers=2).extract_content_from_pdf(PDF_PATH)
+
+
+@pytest.mark.skipif(not os.path.exists(PDF_PATH), reason="PDF de ejemplo no disponible")
+def test_sharded_extraction_matches_sequential(tmp_path, monkeypatch):
+    """Con el pool de procesos forzado, los chunks, metadatos e imágenes no cambian."""
+    # Las imágenes extraídas se guardan en ./extracted_images
+    monkeypatch.chdir(tmp_path)
+
+    sequential = _extract(10**9, monkeypatch)
+    sharded = _extract(1, monkeypatch)
+
+    assert sequential.text_chunks
+    assert sharded.text_chunks == sequential.text_chunks
+    assert sharded.metadata == sequential.metadata
+    assert sharded.images == sequential.images
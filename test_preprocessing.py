@@ -7,15 +7,32 @@ y almacenar los datos en FAISS.
 import os
 import sys
 import logging
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
 
 # Agregar el directorio src al path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.utils.preprocess import PDFPreprocessor
+from src.app.ingestion.models import ExtractedContent
+from src.utils.preprocessing.pdf_processor import PDFPreprocessor
+from src.utils.embeddings.generator import EmbeddingsGenerator
 from src.database.core_faiss import FAISSVectorStore
 
 
+# Por debajo de este tamaño la búsqueda exhaustiva es exacta y suficientemente rápida
+FLAT_INDEX_MAX_VECTORS = 10_000
+
+# A partir de este tamaño se cuantiza a 8 bits (384 floats = 1.5 KB por vector sin cuantizar)
+SQ8_MIN_VECTORS = 100_000
+
+# Chunks que se codifican y agregan a FAISS por lote
+EMBEDDING_BATCH_SIZE = 256
+
+
 def setup_logging():
     """Configurar logging para el ejemplo."""
     logging.basicConfig(
@@ -24,6 +41,80 @@ def setup_logging():
     )
 
 
+@lru_cache(maxsize=4)
+def _get_embeddings_generator(embedding_model: str = "all-MiniLM-L6-v2") -> EmbeddingsGenerator:
+    """
+    Un solo generador por modelo, compartido por main() y la demo.
+    La caché persistente de embeddings se usa solo si EMBEDDINGS_CACHE_DIR está definido.
+    """
+    return EmbeddingsGenerator(embedding_model, cache_dir=os.getenv("EMBEDDINGS_CACHE_DIR") or None)
+
+
+# Embeddings (bytes inmutables) de las queries ya codificadas en esta sesión, por (modelo, texto):
+# las repetidas no vuelven a pasar por el tokenizador ni por el modelo. LRU de tamaño acotado.
+_QUERY_EMBEDDINGS: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+_QUERY_CACHE_MAX_SIZE = 1024
+
+
+def encode_queries(texts: List[str], embedding_model: str = "all-MiniLM-L6-v2") -> np.ndarray:
+    """
+    Devuelve los embeddings (n_queries, dimensión) de varias queries.
+    Solo las no vistas en esta sesión se tokenizan y codifican, todas juntas en un único lote.
+    """
+    unique_texts = list(dict.fromkeys(texts))
+    vectors = {}
+    missing = []
+    for text in unique_texts:
+        key = (embedding_model, text)
+        if key in _QUERY_EMBEDDINGS:
+            _QUERY_EMBEDDINGS.move_to_end(key)  # Uso reciente
+            vectors[text] = _QUERY_EMBEDDINGS[key]
+        else:
+            missing.append(text)
+
+    if missing:
+        embeddings_generator = _get_embeddings_generator(embedding_model)
+        embeddings = embeddings_generator.generate_embeddings(missing)
+        for text, embedding in zip(missing, embeddings):
+            vectors[text] = np.asarray(embedding, dtype=np.float32).tobytes()
+            _QUERY_EMBEDDINGS[(embedding_model, text)] = vectors[text]
+            # Expulsar la entrada usada hace más tiempo en lugar de vaciar la caché entera
+            if len(_QUERY_EMBEDDINGS) > _QUERY_CACHE_MAX_SIZE:
+                _QUERY_EMBEDDINGS.popitem(last=False)
+
+    # np.stack copia: matriz escribible y C-contigua (FAISS normaliza el query en el propio array)
+    return np.stack([np.frombuffer(vectors[text], dtype=np.float32) for text in texts])
+
+
+def encode_query(text: str, embedding_model: str = "all-MiniLM-L6-v2") -> np.ndarray:
+    """Devuelve el embedding (1, dimensión) de una query; las repetidas no vuelven al modelo."""
+    return encode_queries([text], embedding_model)
+
+
+def iter_pdf_batches(content: ExtractedContent,
+                     batch_size: int = EMBEDDING_BATCH_SIZE,
+                     embedding_model: str = "all-MiniLM-L6-v2") -> Iterator[Dict[str, Any]]:
+    """
+    Genera los embeddings del contenido extraído por lotes de batch_size chunks.
+    Cada lote tiene la forma de processed_data y se agrega a FAISS antes de codificar el siguiente,
+    así la matriz completa de embeddings nunca está en memoria junto a la copia interna de FAISS.
+    Con EMBEDDINGS_CACHE_DIR definido, los chunks ya codificados salen de la caché persistente.
+    """
+    embeddings_generator = _get_embeddings_generator(embedding_model)
+
+    for start in range(0, len(content.text_chunks), batch_size):
+        text_chunks = content.text_chunks[start:start + batch_size]
+        yield {
+            "text_chunks": text_chunks,
+            "metadata": content.metadata[start:start + batch_size],
+            "images": content.images,
+            # float32 C-contiguo: FAISS lo usa sin copia interna en normalize_L2/add
+            "embeddings": np.ascontiguousarray(
+                embeddings_generator.generate_embeddings(text_chunks), dtype=np.float32
+            )
+        }
+
+
 def main():
     """Función principal para probar el preprocesamiento completo."""
     setup_logging()
@@ -41,52 +132,47 @@ def main():
     logger.info("🚀 Iniciando preprocesamiento del PDF...")
 
     try:
-        # 1. Procesar el PDF
+        # 1. Extraer el contenido del PDF
         logger.info("📄 Extrayendo contenido del PDF...")
-        processed_data = process_pdf_document(
-            pdf_path=pdf_path,
-            chunk_size=500,
-            chunk_overlap=50,
-            embedding_model="all-MiniLM-L6-v2"
-        )
+        preprocessor = PDFPreprocessor(chunk_size=500, chunk_overlap=50)
+        content = preprocessor.extract_content_from_pdf(pdf_path)
+        total_chunks = len(content.text_chunks)
+        embedding_dimension = _get_embeddings_generator("all-MiniLM-L6-v2").get_embedding_dimension()
 
         # Mostrar estadísticas
         logger.info(f"✅ Contenido extraído:")
         logger.info(f" Texto")
-        logger.info(f"   - Chunks de texto: {processed_data['total_chunks']}")
-        logger.info(f"   - Imágenes: {processed_data['total_images']}")
-        logger.info(f"   - Dimensión embeddings: {processed_data['embedding_dimension']}")
+        logger.info(f"   - Chunks de texto: {total_chunks}")
+        logger.info(f"   - Imágenes: {len(content.images)}")
+        logger.info(f"   - Dimensión embeddings: {embedding_dimension}")
 
         # 2. Crear y poblar la base de datos vectorial FAISS
         logger.info("🔍 Creando base de datos vectorial FAISS...")
 
+        # Embeddings normalizados: el producto interno da la similitud coseno directamente.
+        # Corpus grandes: HNSW evita el recorrido O(N·d) del índice plano en cada búsqueda;
+        # los muy grandes se cuantizan (SQ8) para que el índice quepa en memoria
+        if total_chunks < FLAT_INDEX_MAX_VECTORS:
+            index_type = "ip"
+        elif total_chunks < SQ8_MIN_VECTORS:
+            index_type = "hnsw"
+        else:
+            index_type = "sq8"
+        # Con faiss-gpu y una GPU visible, add/search corren en GPU (HNSW y SQ8 se quedan en CPU)
         vector_store = FAISSVectorStore(
-            dimension=processed_data['embedding_dimension'],
-            index_type="flat"
+            dimension=embedding_dimension,
+            index_type=index_type,
+            use_gpu=True
         )
 
-        # Preparar metadatos para FAISS
-        image_paths = []
-        page_numbers = []
-        chunk_ids = []
-
-        for i, metadata in enumerate(processed_data['metadata']):
-            # Obtener ruta de imagen asociada (si existe)
-            associated_images = metadata.get('associated_images', [])
-            img_path = associated_images[0]['path'] if associated_images else None
-            image_paths.append(img_path)
-
-            page_numbers.append(metadata['page_number'])
-            chunk_ids.append(metadata['chunk_id'])
-
-        # Agregar embeddings a FAISS
-        ids = vector_store.add_embeddings(
-            embeddings=processed_data['embeddings'],
-            texts=processed_data['text_chunks'],
-            image_paths=image_paths,
-            page_numbers=page_numbers,
-            chunk_ids=chunk_ids
-        )
+        # Los índices que requieren entrenamiento se entrenan con la matriz completa en un solo lote
+        batch_size = EMBEDDING_BATCH_SIZE if vector_store.index.is_trained else max(total_chunks, 1)
+
+        # Agregar embeddings a FAISS lote a lote: page_number, chunk_id e imágenes salen de
+        # los metadatos de cada chunk dentro de add_embeddings, sin listas paralelas aquí
+        ids = []
+        for batch in iter_pdf_batches(content, batch_size=batch_size, embedding_model="all-MiniLM-L6-v2"):
+            ids.extend(vector_store.add_embeddings(processed_data=batch))
 
         logger.info(f"✅ {len(ids)} embeddings agregados a FAISS")
 
@@ -98,10 +184,9 @@ def main():
         # 4. Probar búsqueda
         logger.info("🔎 Probando búsqueda de ejemplo...")
 
-        # Crear query de ejemplo
-        test_preprocessor = PDFPreprocessor()
+        # Crear query de ejemplo (las queries repetidas salen de la caché)
         query_text = "What is machine learning?"
-        query_embedding = test_preprocessor.embedding_model.encode([query_text])
+        query_embedding = encode_query(query_text)
 
         # Buscar documentos similares
         distances, results = vector_store.search(
@@ -145,12 +230,9 @@ def demo_load_and_search():
     logger.info("📖 Cargando índice FAISS existente...")
 
     # Cargar índice
-    vector_store = FAISSVectorStore()
+    vector_store = FAISSVectorStore(use_gpu=True)
     vector_store.load_index(faiss_index_path)
 
-    # Crear modelo para queries
-    preprocessor = PDFPreprocessor()
-
     # Queries de ejemplo
     test_queries = [
         "What is artificial intelligence?",
@@ -159,18 +241,14 @@ def demo_load_and_search():
         "Explain machine learning algorithms"
     ]
 
-    for query in test_queries:
-        logger.info(f"🔍 Búsqueda: '{query}'")
+    # Generar los embeddings de todas las queries en un solo lote
+    query_embeddings = encode_queries(test_queries)
 
-        # Generar embedding del query
-        query_embedding = preprocessor.embedding_model.encode([query])
+    # Buscar todas las queries en una sola llamada a FAISS
+    _, batch_results = vector_store.search_batch(query_embeddings, k=2)
 
-        # Buscar
-        distances, results = vector_store.search(
-            query_embedding=query_embedding,
-            k=2,
-            return_metadata=True
-        )
+    for query, results in zip(test_queries, batch_results):
+        logger.info(f"🔍 Búsqueda: '{query}'")
 
         for i, result in enumerate(results):
             logger.info(f"   {i+1}. Página {result['page_number']}, Similitud: {result['similarity']:.3f}")
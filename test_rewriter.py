@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la heurística que decide si una pregunta se envía al LLM para reescribirla.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Agregar el directorio src al path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.rewritter.rewriter import is_well_formed_question
+
+
+@pytest.mark.parametrize("question", [
+    "What are the main benefits of machine learning described here?",
+    "¿Qué es la generación aumentada por recuperación en este documento?",
+    "¿Cómo se calcula la similitud entre los embeddings del índice?",
+    "Según el documento, ¿cuál es el objetivo principal del reto RAG?",
+    "  Who are the authors mentioned in this research paper?  ",
+])
+def test_well_formed_question_skips_rewrite(question):
+    """Preguntas largas, terminadas en '?' y con palabra interrogativa: no se reescriben."""
+    assert is_well_formed_question(question)
+
+
+@pytest.mark.parametrize("question", [
+    # Demasiado cortas, aunque estén bien formadas
+    "¿Qué es RAG?",
+    "Who are the authors?",
+    # Fragmentos y consultas de solo palabras clave
+    "authors",
+    "machine learning benefits",
+    "benefits of machine learning in the document described here",
+    # Sin signo de interrogación final
+    "What are the main benefits of machine learning described here",
+    # Las palabras interrogativas solo aparecen como subcadenas ("show", "whole", "somehow"...)
+    "Show me the whole list of authors in the document please?",
+    "Explain the whole architecture of the retrieval system shown in the paper?",
+    "somehow nowhere whatever whoever anyhow wherever showcase wholesale?",
+])
+def test_question_needing_rewrite_is_not_well_formed(question):
+    """Fragmentos, consultas cortas o sin palabra interrogativa completa: pasan por el LLM."""
+    assert not is_well_formed_question(question)